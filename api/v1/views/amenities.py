@@ -11,34 +11,27 @@ import uuid
 @app_views.route('/amenities/', methods=['GET'])
 def list_amenities():
     '''Obtains an inventory of every Amenity object.'''
-    list_amenities = [obj.to_dict() for obj in storage.all("Amenity").values()]
+    list_amenities = [obj.to_dict() for obj in storage.query("Amenity")]
     return jsonify(list_amenities)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'])
 def get_amenity(amenity_id):
     '''Obtains an Amenity item'''
-    all_amenities = storage.all("Amenity").values()
-    amenity_obj = [obj.to_dict() for obj in all_amenities
-                   if obj.id == amenity_id]
-    if amenity_obj == []:
+    amenity_obj = storage.get("Amenity", amenity_id)
+    if amenity_obj is None:
         abort(404)
-    return jsonify(amenity_obj[0])
+    return jsonify(amenity_obj.to_dict())
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['DELETE'])
 def delete_amenity(amenity_id):
     '''Removes a component of an amenity'''
-    all_amenities = storage.all("Amenity").values()
-    amenity_obj = [obj.to_dict() for obj in all_amenities
-                   if obj.id == amenity_id]
-    if amenity_obj == []:
+    amenity_obj = storage.get("Amenity", amenity_id)
+    if amenity_obj is None:
         abort(404)
-    amenity_obj.remove(amenity_obj[0])
-    for obj in all_amenities:
-        if obj.id == amenity_id:
-            storage.delete(obj)
-            storage.save()
+    storage.delete(amenity_obj)
+    storage.save()
     return jsonify({}), 200
 
 
@@ -60,16 +53,11 @@ def create_amenity():
 @app_views.route('/amenities/<amenity_id>', methods=['PUT'])
 def updates_amenity(amenity_id):
     '''Revises Amenity object'''
-    all_amenities = storage.all("Amenity").values()
-    amenity_obj = [obj.to_dict() for obj in all_amenities
-                   if obj.id == amenity_id]
-    if amenity_obj == []:
+    amenity_obj = storage.get("Amenity", amenity_id)
+    if amenity_obj is None:
         abort(404)
     if not request.get_json():
         abort(400, 'Not a JSON')
-    amenity_obj[0]['name'] = request.json['name']
-    for obj in all_amenities:
-        if obj.id == amenity_id:
-            obj.name = request.json['name']
-    storage.save()
-    return jsonify(amenity_obj[0]), 200
+    amenity_obj.name = request.json['name']
+    amenity_obj.save()
+    return jsonify(amenity_obj.to_dict()), 200
@@ -13,12 +13,11 @@ import uuid
 @app_views.route('/states/<state_id>/cities/', methods=['GET'])
 def list_cities_of_state(state_id):
     '''Obtains list of every object in the City'''
-    all_states = storage.all("State").values()
-    state_obj = [obj.to_dict() for obj in all_states if obj.id == state_id]
-    if state_obj == []:
+    if storage.get("State", state_id) is None:
         abort(404)
-    list_cities = [obj.to_dict() for obj in storage.all("City").values()
-                   if state_id == obj.state_id]
+    cities = storage.query("City", where={"state_id": state_id})
+    list_cities = [obj.to_dict()
+                   for obj in cities]
     return jsonify(list_cities)
 
 
@@ -30,9 +29,7 @@ def create_city(state_id):
         abort(400, 'Not a JSON')
     if 'name' not in request.get_json():
         abort(400, 'Missing name')
-    all_states = storage.all("State").values()
-    state_obj = [obj.to_dict() for obj in all_states if obj.id == state_id]
-    if state_obj == []:
+    if storage.get("State", state_id) is None:
         abort(404)
     cities = []
     new_city = City(name=request.json['name'], state_id=state_id)
@@ -45,40 +42,31 @@ def create_city(state_id):
 @app_views.route('/cities/<city_id>', methods=['GET'])
 def get_city(city_id):
     '''Brings up a City object'''
-    all_cities = storage.all("City").values()
-    city_obj = [obj.to_dict() for obj in all_cities if obj.id == city_id]
-    if city_obj == []:
+    city_obj = storage.get("City", city_id)
+    if city_obj is None:
         abort(404)
-    return jsonify(city_obj[0])
+    return jsonify(city_obj.to_dict())
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'])
 def delete_city(city_id):
     '''Removes a City entity'''
-    all_cities = storage.all("City").values()
-    city_obj = [obj.to_dict() for obj in all_cities if obj.id == city_id]
-    if city_obj == []:
+    city_obj = storage.get("City", city_id)
+    if city_obj is None:
         abort(404)
-    city_obj.remove(city_obj[0])
-    for obj in all_cities:
-        if obj.id == city_id:
-            storage.delete(obj)
-            storage.save()
+    storage.delete(city_obj)
+    storage.save()
     return jsonify({}), 200
 
 
 @app_views.route('/cities/<city_id>', methods=['PUT'])
 def updates_city(city_id):
     '''Reveals a City item'''
-    all_cities = storage.all("City").values()
-    city_obj = [obj.to_dict() for obj in all_cities if obj.id == city_id]
-    if city_obj == []:
+    city_obj = storage.get("City", city_id)
+    if city_obj is None:
         abort(404)
     if not request.get_json():
         abort(400, 'Not a JSON')
-    city_obj[0]['name'] = request.json['name']
-    for obj in all_cities:
-        if obj.id == city_id:
-            obj.name = request.json['name']
-    storage.save()
-    return jsonify(city_obj[0]), 200
+    city_obj.name = request.json['name']
+    city_obj.save()
+    return jsonify(city_obj.to_dict()), 200
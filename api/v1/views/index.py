@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 """the index"""
 from api.v1.views import app_views
-from flask import jsonify
+from flask import jsonify, abort
 from models import storage
 from models.user import User
 from models.place import Place
@@ -21,6 +21,14 @@ def status():
     return jsonify({'status': 'OK'})
 
 
+@app_views.route('/status/pool', methods=['GET'])
+def pool_status():
+    ''' reports the connections of the storage engine pool '''
+    if not hasattr(storage, "pool_stats"):
+        abort(404)
+    return jsonify(storage.pool_stats())
+
+
 @app_views.route('/stats', methods=['GET'])
 def count():
     '''obtains each object number according to its kind'''
@@ -8,43 +8,103 @@ from models.place import Place
 from datetime import datetime
 import uuid
 
+range_filters = ("price_by_night", "max_guest", "number_rooms",
+                 "number_bathrooms")
+
+
+def range_conditions():
+    '''Builds query() conditions from <attr>_min and <attr>_max'''
+    where = {}
+    for attr in range_filters:
+        bounds = {}
+        for suffix, op in (("_min", "gte"), ("_max", "lte")):
+            value = request.args.get(attr + suffix)
+            if value is not None:
+                try:
+                    bounds[op] = int(value)
+                except ValueError:
+                    abort(400, 'Not a number')
+        if bounds:
+            where[attr] = bounds
+    return where
+
+
+def limit_arg():
+    '''Reads the limit query argument, None if not given'''
+    limit = request.args.get('limit')
+    if limit is None:
+        return None
+    try:
+        limit = int(limit)
+    except ValueError:
+        abort(400, 'Not a number')
+    if limit < 0:
+        abort(400, 'Not a number')
+    return limit
+
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'])
 @app_views.route('/cities/<city_id>/places/', methods=['GET'])
 def list_places_of_city(city_id):
     '''Retrieves a list of all Place objects in city'''
-    all_cities = storage.all("City").values()
-    city_obj = [obj.to_dict() for obj in all_cities if obj.id == city_id]
-    if city_obj == []:
+    if storage.get("City", city_id) is None:
         abort(404)
-    list_places = [obj.to_dict() for obj in storage.all("Place").values()
-                   if city_id == obj.city_id]
+    where = range_conditions()
+    where["city_id"] = city_id
+    if request.args.get('amenities'):
+        where["amenity_ids"] = request.args['amenities'].split(',')
+    places = storage.query("Place", where=where)
+    list_places = [obj.to_dict()
+                   for obj in places]
     return jsonify(list_places)
 
 
+@app_views.route('/places/near', methods=['GET'])
+def list_places_near():
+    '''Retrieves the places within radius kilometers of lat, lng'''
+    try:
+        lat = float(request.args['lat'])
+        lng = float(request.args['lng'])
+        radius = float(request.args.get('radius', 10))
+    except (KeyError, ValueError):
+        abort(400, 'Missing lat or lng')
+    if not radius >= 0:
+        abort(400, 'Not a radius')
+    limit = limit_arg()
+    places = storage.near(lat, lng, radius, limit)
+    return jsonify([obj.to_dict() for obj in places])
+
+
+@app_views.route('/places/within', methods=['GET'])
+def list_places_within():
+    '''Retrieves the places inside bbox=south,west,north,east'''
+    try:
+        south, west, north, east = [
+            float(edge) for edge in request.args['bbox'].split(',')]
+    except (KeyError, ValueError):
+        abort(400, 'Missing bbox')
+    limit = limit_arg()
+    places = storage.within(south, west, north, east, limit)
+    return jsonify([obj.to_dict() for obj in places])
+
+
 @app_views.route('/places/<place_id>', methods=['GET'])
 def get_place(place_id):
     '''Obtains a Place object'''
-    all_places = storage.all("Place").values()
-    place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-    if place_obj == []:
+    place_obj = storage.get("Place", place_id)
+    if place_obj is None:
         abort(404)
-    return jsonify(place_obj[0])
+    return jsonify(place_obj.to_dict())
 
 
 @app_views.route('/places/<place_id>', methods=['DELETE'])
 def delete_place(place_id):
     '''Removes a Place entity'''
-    all_places = storage.all("Place").values()
-    place_obj = [obj.to_dict() for obj in all_places
-                 if obj.id == place_id]
-    if place_obj == []:
+    place_obj = storage.get("Place", place_id)
+    if place_obj is None:
         abort(404)
-    place_obj.remove(place_obj[0])
-    for obj in all_places:
-        if obj.id == place_id:
-            storage.delete(obj)
-            storage.save()
+    storage.delete(place_obj)
+    storage.save()
     return jsonify({}), 200
 
 
@@ -57,18 +117,12 @@ def create_place(city_id):
         abort(400, 'Missing user_id')
     if 'name' not in request.get_json():
         abort(400, 'Missing name')
-    all_cities = storage.all("City").values()
-    city_obj = [obj.to_dict() for obj in all_cities
-                if obj.id == city_id]
-    if city_obj == []:
+    if storage.get("City", city_id) is None:
         abort(404)
     places = []
     new_place = Place(name=request.json['name'],
                       user_id=request.json['user_id'], city_id=city_id)
-    all_users = storage.all("User").values()
-    user_obj = [obj.to_dict() for obj in all_users
-                if obj.id == new_place.user_id]
-    if user_obj == []:
+    if storage.get("User", new_place.user_id) is None:
         abort(404)
     storage.new(new_place)
     storage.save()
@@ -79,45 +133,46 @@ def create_place(city_id):
 @app_views.route('/places/<place_id>', methods=['PUT'])
 def updates_place(place_id):
     '''Modifies a Place entity'''
-    all_places = storage.all("Place").values()
-    place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-    if place_obj == []:
+    place_obj = storage.get("Place", place_id)
+    if place_obj is None:
         abort(404)
     if not request.get_json():
         abort(400, 'Not a JSON')
-    if 'name' in request.get_json():
-        place_obj[0]['name'] = request.json['name']
-    if 'description' in request.get_json():
-        place_obj[0]['description'] = request.json['description']
-    if 'number_rooms' in request.get_json():
-        place_obj[0]['number_rooms'] = request.json['number_rooms']
-    if 'number_bathrooms' in request.get_json():
-        place_obj[0]['number_bathrooms'] = request.json['number_bathrooms']
-    if 'max_guest' in request.get_json():
-        place_obj[0]['max_guest'] = request.json['max_guest']
-    if 'price_by_night' in request.get_json():
-        place_obj[0]['price_by_night'] = request.json['price_by_night']
-    if 'latitude' in request.get_json():
-        place_obj[0]['latitude'] = request.json['latitude']
-    if 'longitude' in request.get_json():
-        place_obj[0]['longitude'] = request.json['longitude']
-    for obj in all_places:
-        if obj.id == place_id:
-            if 'name' in request.get_json():
-                obj.name = request.json['name']
-            if 'description' in request.get_json():
-                obj.description = request.json['description']
-            if 'number_rooms' in request.get_json():
-                obj.number_rooms = request.json['number_rooms']
-            if 'number_bathrooms' in request.get_json():
-                obj.number_bathrooms = request.json['number_bathrooms']
-            if 'max_guest' in request.get_json():
-                obj.max_guest = request.json['max_guest']
-            if 'price_by_night' in request.get_json():
-                obj.price_by_night = request.json['price_by_night']
-            if 'latitude' in request.get_json():
-                obj.latitude = request.json['latitude']
-            if 'longitude' in request.get_json():
-                obj.longitude = request.json['longitude']
-    storage.save()
-    return jsonify(place_obj[0]), 200
+    place_obj.update({attr: request.json[attr] for attr in (
+        'name', 'description', 'number_rooms', 'number_bathrooms',
+        'max_guest', 'price_by_night', 'latitude', 'longitude')
+        if attr in request.get_json()})
+    return jsonify(place_obj.to_dict()), 200
+
+
+@app_views.route('/places_search', methods=['POST'])
+def search_places():
+    '''Retrieves the places in the given states and cities that have
+    all the given amenities, limit places from offset'''
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        abort(400, 'Not a JSON')
+    states = body.get('states') or []
+    cities = body.get('cities') or []
+    amenities = body.get('amenities') or []
+    limit = body.get('limit')
+    offset = body.get('offset', 0)
+    for ids in (states, cities, amenities):
+        if not isinstance(ids, list):
+            abort(400, 'Not a list')
+        if not all(isinstance(id, str) for id in ids):
+            abort(400, 'Not a list of IDs')
+    for number in (limit, offset):
+        if number is not None and (type(number) is not int or number < 0):
+            abort(400, 'Not a number')
+    where = {}
+    if states or cities:
+        city_ids = set(cities)
+        if states:
+            city_ids.update(city.id for city in storage.query(
+                "City", where={"state_id": states}))
+        where["city_id"] = city_ids
+    if amenities:
+        where["amenity_ids"] = amenities
+    places = storage.query("Place", where=where, limit=limit, offset=offset)
+    return jsonify([obj.to_dict() for obj in places])
@@ -9,150 +9,99 @@ from datetime import datetime
 import uuid
 from os import getenv
 
-if getenv('HBNB_TYPE_STORAGE') == 'db':
+if getenv('HBNB_TYPE_STORAGE') in ('db', 'sqlite'):
     @app_views.route('/places/<place_id>/amenities', methods=['GET'])
     @app_views.route('/places/<place_id>/amenities/', methods=['GET'])
     def list_amenities_of_place(place_id):
         ''' obtains a list of every item in a places amenities. '''
-        all_places = storage.all("Place").values()
-        place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-        if place_obj == []:
+        place_obj = storage.get("Place", place_id,
+                                load={"amenities": "joined"})
+        if place_obj is None:
             abort(404)
-        list_amenities = []
-        for obj in all_places:
-            if obj.id == place_id:
-                for amenity in obj.amenities:
-                    list_amenities.append(amenity.to_dict())
+        list_amenities = [amenity.to_dict()
+                          for amenity in place_obj.amenities]
         return jsonify(list_amenities)
 
     @app_views.route('/places/<place_id>/amenities/<amenity_id>',
                      methods=['POST'])
     def create_place_amenity(place_id, amenity_id):
         '''Builds a Amenity'''
-        all_places = storage.all("Place").values()
-        place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-        if place_obj == []:
+        place_obj = storage.get("Place", place_id)
+        if place_obj is None:
             abort(404)
-
-        all_amenities = storage.all("Amenity").values()
-        amenity_obj = [obj.to_dict() for obj in all_amenities
-                       if obj.id == amenity_id]
-        if amenity_obj == []:
+        amenity_obj = storage.get("Amenity", amenity_id)
+        if amenity_obj is None:
             abort(404)
-
-        amenities = []
-        for place in all_places:
-            if place.id == place_id:
-                for amenity in all_amenities:
-                    if amenity.id == amenity_id:
-                        place.amenities.append(amenity)
-                        storage.save()
-                        amenities.append(amenity.to_dict())
-                        return jsonify(amenities[0]), 200
-        return jsonify(amenities[0]), 201
+        if amenity_obj in place_obj.amenities:
+            return jsonify(amenity_obj.to_dict()), 200
+        place_obj.amenities.append(amenity_obj)
+        storage.save()
+        return jsonify(amenity_obj.to_dict()), 201
 
     @app_views.route('/places/<place_id>/amenities/<amenity_id>',
                      methods=['DELETE'])
     def delete_place_amenity(place_id, amenity_id):
         '''Takes away an Amenity item.'''
-        all_places = storage.all("Place").values()
-        place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-        if place_obj == []:
+        place_obj = storage.get("Place", place_id)
+        if place_obj is None:
             abort(404)
-
-        all_amenities = storage.all("Amenity").values()
-        amenity_obj = [obj.to_dict() for obj in all_amenities
-                       if obj.id == amenity_id]
-        if amenity_obj == []:
+        amenity_obj = storage.get("Amenity", amenity_id)
+        if amenity_obj is None:
             abort(404)
-        amenity_obj.remove(amenity_obj[0])
-
-        for obj in all_places:
-            if obj.id == place_id:
-                if obj.amenities == []:
-                    abort(404)
-                for amenity in obj.amenities:
-                    if amenity.id == amenity_id:
-                        storage.delete(amenity)
-                        storage.save()
+        if amenity_obj not in place_obj.amenities:
+            abort(404)
+        place_obj.amenities.remove(amenity_obj)
+        storage.save()
         return jsonify({}), 200
-"""
 else:
     @app_views.route('/places/<place_id>/amenities', methods=['GET'])
     @app_views.route('/places/<place_id>/amenities/', methods=['GET'])
     def list_amenities_of_place(place_id):
         ''' obtains a list of every item in a places amenities. '''
-        all_places = storage.all("Place").values()
-        place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-        if place_obj == []:
+        place_obj = storage.get("Place", place_id)
+        if place_obj is None:
             abort(404)
-        list_amenities = []
-        for obj in all_places:
-            if obj.id == place_id:
-                for amenity in obj.amenities:
-                    list_amenities.append(amenity.to_dict())
+        list_amenities = [amenity.to_dict()
+                          for amenity in place_obj.amenities]
         return jsonify(list_amenities)
 
     @app_views.route('/places/<place_id>/amenities/<amenity_id>',
                      methods=['POST'])
     def create_place_amenity(place_id, amenity_id):
         '''Builds an Amenity'''
-        all_places = storage.all("Place").values()
-        place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-        if place_obj == []:
+        place_obj = storage.get("Place", place_id)
+        if place_obj is None:
             abort(404)
-
-        all_amenities = storage.all("Amenity").values()
-        amenity_obj = [obj.to_dict() for obj in all_amenities
-                       if obj.id == amenity_id]
-        if amenity_obj == []:
+        amenity_obj = storage.get("Amenity", amenity_id)
+        if amenity_obj is None:
             abort(404)
-
-        amenities = []
-        for place in all_places:
-            if place.id == place_id:
-                for amenity in all_amenities:
-                    if amenity.id == amenity_id:
-                        place.amenities.append(amenity)
-                        storage.save()
-                        amenities.append(amenity.to_dict())
-                        return jsonify(amenities[0]), 200
-        return jsonify(amenities[0]), 201
+        if amenity_id in place_obj.amenity_ids:
+            return jsonify(amenity_obj.to_dict()), 200
+        place_obj.amenities = amenity_obj
+        place_obj.save()
+        return jsonify(amenity_obj.to_dict()), 201
 
     @app_views.route('/places/<place_id>/amenities/<amenity_id>',
                      methods=['DELETE'])
     def delete_place_amenity(place_id, amenity_id):
         '''Removes an Amenity object'''
-        all_places = storage.all("Place").values()
-        place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-        if place_obj == []:
+        place_obj = storage.get("Place", place_id)
+        if place_obj is None:
             abort(404)
-
-        all_amenities = storage.all("Amenity").values()
-        amenity_obj = [obj.to_dict() for obj in all_amenities
-                       if obj.id == amenity_id]
-        if amenity_obj == []:
+        if storage.get("Amenity", amenity_id) is None:
             abort(404)
-        amenity_obj.remove(amenity_obj[0])
-
-        for obj in all_places:
-            if obj.id == place_id:
-                if obj.amenities == []:
-                    abort(404)
-                for amenity in obj.amenities:
-                    if amenity.id == amenity_id:
-                        storage.delete(amenity)
-                        storage.save()
+        if amenity_id not in place_obj.amenity_ids:
+            abort(404)
+        place_obj.amenity_ids = [id for id in place_obj.amenity_ids
+                                 if id != amenity_id]
+        place_obj.save()
         return jsonify({}), 200
-"""
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'])
 def get_place_amenity(amenity_id):
     '''Brings up an Amenity object '''
-    all_amenities = storage.all("Amenity").values()
-    amenity_obj = [obj.to_dict() for obj in all_amenities
-                   if obj.id == amenity_id]
-    if amenity_obj == []:
+    amenity_obj = storage.get("Amenity", amenity_id)
+    if amenity_obj is None:
         abort(404)
-    return jsonify(amenity_obj[0])
+    return jsonify(amenity_obj.to_dict())
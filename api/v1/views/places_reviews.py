@@ -13,12 +13,10 @@ import uuid
 @app_views.route('/places/<place_id>/reviews/', methods=['GET'])
 def list_reviews_of_place(place_id):
     ''' obtains a list of a places review objects. '''
-    all_places = storage.all("Place").values()
-    place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-    if place_obj == []:
+    if storage.get("Place", place_id) is None:
         abort(404)
-    list_reviews = [obj.to_dict() for obj in storage.all("Review").values()
-                    if place_id == obj.place_id]
+    list_reviews = [obj.to_dict() for obj in
+                    storage.query("Review", where={"place_id": place_id})]
     return jsonify(list_reviews)
 
 
@@ -32,13 +30,9 @@ def create_review(place_id):
     user_id = request.json['user_id']
     if 'text' not in request.get_json():
         abort(400, 'Missing text')
-    all_places = storage.all("Place").values()
-    place_obj = [obj.to_dict() for obj in all_places if obj.id == place_id]
-    if place_obj == []:
+    if storage.get("Place", place_id) is None:
         abort(404)
-    all_users = storage.all("User").values()
-    user_obj = [obj.to_dict() for obj in all_users if obj.id == user_id]
-    if user_obj == []:
+    if storage.get("User", user_id) is None:
         abort(404)
     reviews = []
     new_review = Review(text=request.json['text'], place_id=place_id,
@@ -52,41 +46,32 @@ def create_review(place_id):
 @app_views.route('/reviews/<review_id>', methods=['GET'])
 def get_review(review_id):
     '''Retrieves a Review object '''
-    all_reviews = storage.all("Review").values()
-    review_obj = [obj.to_dict() for obj in all_reviews if obj.id == review_id]
-    if review_obj == []:
+    review_obj = storage.get("Review", review_id)
+    if review_obj is None:
         abort(404)
-    return jsonify(review_obj[0])
+    return jsonify(review_obj.to_dict())
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'])
 def delete_review(review_id):
     '''Removes a Review item'''
-    all_reviews = storage.all("Review").values()
-    review_obj = [obj.to_dict() for obj in all_reviews if obj.id == review_id]
-    if review_obj == []:
+    review_obj = storage.get("Review", review_id)
+    if review_obj is None:
         abort(404)
-    review_obj.remove(review_obj[0])
-    for obj in all_reviews:
-        if obj.id == review_id:
-            storage.delete(obj)
-            storage.save()
+    storage.delete(review_obj)
+    storage.save()
     return jsonify({}), 200
 
 
 @app_views.route('/reviews/<review_id>', methods=['PUT'])
 def updates_review(review_id):
     '''Revises an object under review'''
-    all_reviews = storage.all("Review").values()
-    review_obj = [obj.to_dict() for obj in all_reviews if obj.id == review_id]
-    if review_obj == []:
+    review_obj = storage.get("Review", review_id)
+    if review_obj is None:
         abort(404)
     if not request.get_json():
         abort(400, 'Not a JSON')
     if 'text' in request.get_json():
-        review_obj[0]['text'] = request.json['text']
-        for obj in all_reviews:
-            if obj.id == review_id:
-                obj.text = request.json['text']
-        storage.save()
-    return jsonify(review_obj[0]), 200
+        review_obj.text = request.json['text']
+        review_obj.save()
+    return jsonify(review_obj.to_dict()), 200
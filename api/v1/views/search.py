@@ -0,0 +1,22 @@
+#!/usr/bin/python3
+"""the search"""
+from api.v1.views import app_views
+from flask import jsonify, abort, request
+from models import storage
+
+
+@app_views.route('/search', methods=['GET'])
+def search():
+    '''Ranks the Place and Review objects matching the words of q'''
+    text = request.args.get('q', '')
+    cls = request.args.get('class')
+    if cls is not None and cls not in ('Place', 'Review'):
+        abort(400, 'Unknown class')
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        abort(400, 'Not a number')
+    if limit < 0:
+        abort(400, 'Not a number')
+    found = storage.search(text, cls, limit)
+    return jsonify([obj.to_dict() for obj in found])
@@ -11,32 +11,27 @@ import uuid
 @app_views.route('/states/', methods=['GET'])
 def list_states():
     '''Obtains a list of every object in the State'''
-    list_states = [obj.to_dict() for obj in storage.all("State").values()]
+    list_states = [obj.to_dict() for obj in storage.query("State")]
     return jsonify(list_states)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'])
 def get_state(state_id):
     '''Brings up a State object'''
-    all_states = storage.all("State").values()
-    state_obj = [obj.to_dict() for obj in all_states if obj.id == state_id]
-    if state_obj == []:
+    state_obj = storage.get("State", state_id)
+    if state_obj is None:
         abort(404)
-    return jsonify(state_obj[0])
+    return jsonify(state_obj.to_dict())
 
 
 @app_views.route('/states/<state_id>', methods=['DELETE'])
 def delete_state(state_id):
     '''Eliminates a State entity'''
-    all_states = storage.all("State").values()
-    state_obj = [obj.to_dict() for obj in all_states if obj.id == state_id]
-    if state_obj == []:
+    state_obj = storage.get("State", state_id)
+    if state_obj is None:
         abort(404)
-    state_obj.remove(state_obj[0])
-    for obj in all_states:
-        if obj.id == state_id:
-            storage.delete(obj)
-            storage.save()
+    storage.delete(state_obj)
+    storage.save()
     return jsonify({}), 200
 
 
@@ -58,15 +53,11 @@ def create_state():
 @app_views.route('/states/<state_id>', methods=['PUT'])
 def updates_state(state_id):
     '''Modifies a State object'''
-    all_states = storage.all("State").values()
-    state_obj = [obj.to_dict() for obj in all_states if obj.id == state_id]
-    if state_obj == []:
+    state_obj = storage.get("State", state_id)
+    if state_obj is None:
         abort(404)
     if not request.get_json():
         abort(400, 'Not a JSON')
-    state_obj[0]['name'] = request.json['name']
-    for obj in all_states:
-        if obj.id == state_id:
-            obj.name = request.json['name']
-    storage.save()
-    return jsonify(state_obj[0]), 200
+    state_obj.name = request.json['name']
+    state_obj.save()
+    return jsonify(state_obj.to_dict()), 200
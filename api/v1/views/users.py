@@ -12,32 +12,27 @@ import uuid
 @app_views.route('/users', methods=['GET'])
 def list_users():
     '''Obtains an inventory of every User object'''
-    list_users = [obj.to_dict() for obj in storage.all("User").values()]
+    list_users = [obj.to_dict() for obj in storage.query("User")]
     return jsonify(list_users)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'])
 def get_user(user_id):
     '''Obtains a User object'''
-    all_users = storage.all("User").values()
-    user_obj = [obj.to_dict() for obj in all_users if obj.id == user_id]
-    if user_obj == []:
+    user_obj = storage.get("User", user_id)
+    if user_obj is None:
         abort(404)
-    return jsonify(user_obj[0])
+    return jsonify(user_obj.to_dict())
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'])
 def delete_user(user_id):
     '''Removes a User object'''
-    all_users = storage.all("User").values()
-    user_obj = [obj.to_dict() for obj in all_users if obj.id == user_id]
-    if user_obj == []:
+    user_obj = storage.get("User", user_id)
+    if user_obj is None:
         abort(404)
-    user_obj.remove(user_obj[0])
-    for obj in all_users:
-        if obj.id == user_id:
-            storage.delete(obj)
-            storage.save()
+    storage.delete(user_obj)
+    storage.save()
     return jsonify({}), 200
 
 
@@ -62,31 +57,14 @@ def create_user():
 @app_views.route('/users/<user_id>', methods=['PUT'])
 def updates_user(user_id):
     '''Modifies an item called User'''
-    all_users = storage.all("User").values()
-    user_obj = [obj.to_dict() for obj in all_users if obj.id == user_id]
-    if user_obj == []:
+    user_obj = storage.get("User", user_id)
+    if user_obj is None:
         abort(404)
     if not request.get_json():
         abort(400, 'Not a JSON')
-    try:
-        user_obj[0]['first_name'] = request.json['first_name']
-    except:
-        pass
-    try:
-        user_obj[0]['last_name'] = request.json['last_name']
-    except:
-        pass
-    for obj in all_users:
-        if obj.id == user_id:
-            try:
-                if request.json['first_name'] is not None:
-                    obj.first_name = request.json['first_name']
-            except:
-                pass
-            try:
-                if request.json['last_name'] is not None:
-                    obj.last_name = request.json['last_name']
-            except:
-                pass
-    storage.save()
-    return jsonify(user_obj[0]), 200
+    if request.json.get('first_name') is not None:
+        user_obj.first_name = request.json['first_name']
+    if request.json.get('last_name') is not None:
+        user_obj.last_name = request.json['last_name']
+    user_obj.save()
+    return jsonify(user_obj.to_dict()), 200
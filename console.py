@@ -111,7 +111,7 @@ class HBNBCommand(cmd.Cmd):
             return
         key = class_name + "." + class_id
         try:
-            del obj_dict[key]
+            storage.delete(obj_dict[key])
         except KeyError:
             print("** no instance found **")
         storage.save()
@@ -186,22 +186,32 @@ class HBNBCommand(cmd.Cmd):
         '''
             Determines or counts the quantity of occurrences.
         '''
-        obj_list = []
         storage.reload()
-        objects = storage.all()
         try:
             if len(args) != 0:
                 eval(args)
         except NameError:
             print("** class doesn't exist **")
             return
-        for key, val in objects.items():
-            if len(args) != 0:
-                if type(val) is eval(args):
-                    obj_list.append(val)
-            else:
-                obj_list.append(val)
-        print(len(obj_list))
+        print(storage.count(args or None))
+
+    def do_explain(self, args):
+        '''
+            Runs EXPLAIN on the queries of the API and prints those
+            reading a whole table.
+        '''
+        if not hasattr(storage, "explain"):
+            print("** explain needs a database storage **")
+            return
+        report = storage.explain()
+        scans = 0
+        for entry in report:
+            if entry["full_scans"]:
+                scans += 1
+                print("FULL SCAN {}: {}".format(
+                    ", ".join(entry["full_scans"]),
+                    " ".join(entry["sql"].split())))
+        print("{} queries, {} with a full scan".format(len(report), scans))
 
     def default(self, args):
         '''
@@ -14,6 +14,9 @@ from models.review import Review
 if getenv("HBNB_TYPE_STORAGE", "fs") == "db":
     from models.engine import db_storage
     storage = db_storage.DBStorage()
+elif getenv("HBNB_TYPE_STORAGE") == "sqlite":
+    from models.engine import sqlite_storage
+    storage = sqlite_storage.SQLiteStorage()
 else:
     from models.engine import file_storage
     storage = file_storage.FileStorage()
@@ -14,8 +14,8 @@ class Amenity(BaseModel, Base):
         Execution of the Facilities.
     '''
     __tablename__ = "amenities"
-    if getenv("HBNB_TYPE_STORAGE") == "db":
-        name = Column(String(128), nullable=False)
+    if getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"):
+        name = Column(String(128), nullable=False, index=True)
         place_amenities = relationship("Place", secondary=place_amenity,
                                        back_populates="amenities")
     else:
@@ -4,6 +4,7 @@
 '''
 from os import getenv
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 import models
 from sqlalchemy import Column, String, Integer, DateTime
@@ -19,12 +20,20 @@ class BaseModel:
     '''
     id = Column(String(60), nullable=False, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow(), nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow(), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow(), nullable=False,
+                        index=True)
 
     def __init__(self, *args, **kwargs):
         '''
             Set up the characteristics of the public instance.
         '''
+        with self.__quiet():
+            self.__setup(kwargs)
+
+    def __setup(self, kwargs):
+        '''
+            Set the attributes of a new instance, from kwargs if any.
+        '''
         if (len(kwargs) == 0):
             self.id = str(uuid.uuid4())
             self.created_at = datetime.now()
@@ -46,6 +55,33 @@ class BaseModel:
             if not self.id:
                 self.id = str(uuid.uuid4())
 
+    def __setattr__(self, name, value):
+        '''
+            Set an attribute and let the storage know the object changed.
+        '''
+        super().__setattr__(name, value)
+        if not name.startswith("_") and \
+                "_BaseModel__quiet_depth" not in self.__dict__:
+            storage = getattr(models, "storage", None)
+            if storage is not None:
+                storage.touch(self)
+
+    @contextmanager
+    def __quiet(self):
+        '''
+            Keep the storage from being told of each attribute set in
+            the block; whoever opens it hands the object over once.
+        '''
+        depth = self.__dict__.get("_BaseModel__quiet_depth", 0)
+        self.__dict__["_BaseModel__quiet_depth"] = depth + 1
+        try:
+            yield
+        finally:
+            if depth:
+                self.__dict__["_BaseModel__quiet_depth"] = depth
+            else:
+                del self.__dict__["_BaseModel__quiet_depth"]
+
     def __str__(self):
         '''
             Return the BaseModel class string representation.
@@ -64,10 +100,21 @@ class BaseModel:
         '''
             Add new information to the updated_at attribute.
         '''
-        self.updated_at = datetime.now()
+        with self.__quiet():
+            self.updated_at = datetime.now()
         models.storage.new(self)
         models.storage.save()
 
+    def update(self, attrs):
+        '''
+            Set the attributes in attrs and save, so the storage
+            re-indexes the object once rather than once per attribute.
+        '''
+        with self.__quiet():
+            for name, value in attrs.items():
+                setattr(self, name, value)
+        self.save()
+
     def to_dict(self):
         '''
             Provide the BaseModel class dictionary representation back.
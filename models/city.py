@@ -15,9 +15,10 @@ class City(BaseModel, Base):
         Describe the City class which is derived from BaseModel..
     '''
     __tablename__ = "cities"
-    if getenv("HBNB_TYPE_STORAGE") == "db":
-        name = Column(String(128), nullable=False)
-        state_id = Column(String(60), ForeignKey('states.id'), nullable=False)
+    if getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"):
+        name = Column(String(128), nullable=False, index=True)
+        state_id = Column(String(60), ForeignKey('states.id'), nullable=False,
+                          index=True)
         places = relationship("Place", backref="cities",
                               cascade="all, delete, delete-orphan")
     else:
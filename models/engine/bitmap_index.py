@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+'''
+    Define class BitmapIndex
+'''
+from itertools import compress
+
+_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _bitmap(ordinals):
+    '''
+        Return the int with the bits of ordinals set.
+    '''
+    buf = bytearray(max(ordinals) // 8 + 1)
+    for ordinal in ordinals:
+        buf[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(buf, "little")
+
+
+class BitmapIndex:
+    '''
+        Maps values to sets of keys kept as the bits of an int: every
+        key gets an ordinal, bit n of the bitmap of a value is set when
+        the key of ordinal n has that value, and the keys having
+        several values at once are the AND of their bitmaps.
+        Ordinals of removed keys are given out again.
+    '''
+
+    def __init__(self, items=()):
+        '''
+            Start with the (key, values) pairs of items; the bitmap of
+            each value is built in one pass over its ordinals rather
+            than grown one bit at a time
+        '''
+        self.__ordinals = {}
+        self.__keys = []
+        self.__free = []
+        self.__values = {}
+        for key, values in items:
+            if key not in self.__ordinals:
+                self.__ordinals[key] = len(self.__keys)
+                self.__keys.append(key)
+            self.__values[key] = frozenset(values or ())
+        ordinals = {}
+        for key, values in self.__values.items():
+            for value in values:
+                ordinals.setdefault(value, []).append(self.__ordinals[key])
+        self.__bitmaps = {value: _bitmap(found)
+                          for value, found in ordinals.items()}
+
+    def add(self, key, values):
+        '''
+            Sets, or replaces, the values key has
+        '''
+        values = frozenset(values or ())
+        if self.__values.get(key) == values:
+            return
+        if key in self.__ordinals:
+            ordinal = self.__ordinals[key]
+            old = self.__values[key]
+        else:
+            ordinal = self.__free.pop() if self.__free else len(self.__keys)
+            if ordinal == len(self.__keys):
+                self.__keys.append(key)
+            else:
+                self.__keys[ordinal] = key
+            self.__ordinals[key] = ordinal
+            old = frozenset()
+        bit = 1 << ordinal
+        for value in old - values:
+            self.__clear(value, bit)
+        for value in values - old:
+            self.__bitmaps[value] = self.__bitmaps.get(value, 0) | bit
+        self.__values[key] = values
+
+    def remove(self, key):
+        '''
+            Drops key from the index
+        '''
+        ordinal = self.__ordinals.pop(key, None)
+        if ordinal is None:
+            return
+        bit = 1 << ordinal
+        for value in self.__values.pop(key):
+            self.__clear(value, bit)
+        self.__keys[ordinal] = None
+        self.__free.append(ordinal)
+
+    def all_of(self, values):
+        '''
+            Return an iterator over the keys having every one of values,
+            in ordinal order
+        '''
+        values = list(values)
+        if not values:
+            return (key for key in self.__keys if key is not None)
+        bits = -1
+        for value in values:
+            bits &= self.__bitmaps.get(value, 0)
+            if not bits:
+                return iter(())
+        return self.__decode(bits)
+
+    def any_of(self, values):
+        '''
+            Return an iterator over the keys having at least one of
+            values, in ordinal order
+        '''
+        bits = 0
+        for value in values:
+            bits |= self.__bitmaps.get(value, 0)
+        return self.__decode(bits)
+
+    def __clear(self, value, bit):
+        '''
+            Clears bit in the bitmap of value
+        '''
+        bits = self.__bitmaps[value] & ~bit
+        if bits:
+            self.__bitmaps[value] = bits
+        else:
+            del self.__bitmaps[value]
+
+    def __decode(self, bits):
+        '''
+            Return an iterator over the keys of the ordinals set in bits
+        '''
+        flags = bin(bits)[:1:-1].encode().translate(_FLAGS)
+        return map(self.__keys.__getitem__,
+                   compress(range(len(flags)), flags))
@@ -2,13 +2,123 @@
 '''
     Define class DatabaseStorage
 '''
+import itertools
+import operator
+import re
+from datetime import datetime
 from os import getenv
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy import create_engine, MetaData, bindparam, event, func, or_
+from sqlalchemy import inspect, select, text as sql_text
+from sqlalchemy import Float, String
+from sqlalchemy.sql.expression import SelectBase
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+from sqlalchemy.orm import joinedload, selectinload, RelationshipProperty
+from sqlalchemy.orm.attributes import set_committed_value
 import models
 from models.state import State
 from models.city import City
 from models.base_model import Base
+from models.engine.geo_index import bounding_box, distance
+from models.engine.search_index import SearchIndex
+
+
+_RANGES = {"gt": operator.gt, "gte": operator.ge,
+           "lt": operator.lt, "lte": operator.le}
+_LOADERS = {"selectin": selectinload, "joined": joinedload}
+# a SQLite plan line reading a whole table, not through an index
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+_PROBE = "explain-probe"
+_WORD = re.compile(r"\w+")
+# FTS5 table over the text columns of a table, kept in step with it by
+# triggers; SQLite drops the triggers along with the table
+_SQLITE_FULLTEXT = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5({columns}, "
+    "content='{table}', content_rowid='rowid')",
+    "CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} BEGIN "
+    "INSERT INTO {table}_fts(rowid, {columns}) VALUES (new.rowid, {new}); "
+    "END",
+    "CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} BEGIN "
+    "INSERT INTO {table}_fts({table}_fts, rowid, {columns}) "
+    "VALUES ('delete', old.rowid, {old}); END",
+    "CREATE TRIGGER {table}_fts_update AFTER UPDATE ON {table} BEGIN "
+    "INSERT INTO {table}_fts({table}_fts, rowid, {columns}) "
+    "VALUES ('delete', old.rowid, {old}); "
+    "INSERT INTO {table}_fts(rowid, {columns}) VALUES (new.rowid, {new}); "
+    "END",
+    "INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+_EXPLAINS = itertools.count()
+
+
+def _pool_stats(engine):
+    '''
+        Return the counters of the connection pool of engine
+    '''
+    pool = engine.pool
+    stats = {}
+    for name, method in (("size", "size"), ("checked_in", "checkedin"),
+                         ("checked_out", "checkedout"),
+                         ("overflow", "overflow")):
+        if hasattr(pool, method):
+            stats[name] = getattr(pool, method)()
+    return stats
+
+
+class _Replicas:
+    '''
+        Engines of the read replicas, handed out round-robin or to the
+        one with the fewest connections checked out
+    '''
+
+    def __init__(self, engines, balance="round_robin"):
+        '''
+            Balance the reads over engines
+        '''
+        if balance not in ("round_robin", "least_loaded"):
+            raise ValueError("Unknown balancing: {}".format(balance))
+        self.engines = list(engines)
+        self.__balance = balance
+        self.__next = itertools.cycle(self.engines)
+
+    def pick(self):
+        '''
+            Return the engine the next session should read from
+        '''
+        if self.__balance == "least_loaded":
+            return min(self.engines,
+                       key=lambda engine: engine.pool.checkedout())
+        return next(self.__next)
+
+
+class _RoutedSession(Session):
+    '''
+        Session reading from one of the replicas until it writes, and
+        from the primary from then on so it reads its own writes
+    '''
+
+    def __init__(self, replicas=None, **kwargs):
+        '''
+            Start a session bound to the primary, reading from replicas
+        '''
+        super().__init__(**kwargs)
+        self.__replicas = replicas
+        self.__replica = None
+        self.__primary = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        '''
+            Return the engine for clause: a replica for a SELECT, built
+            or textual with its columns given, the primary for anything
+            else or once the session has written
+        '''
+        if self._flushing or \
+                not isinstance(clause, (SelectBase, type(None))):
+            self.__primary = True
+        elif self.__replicas and not self.__primary and \
+                isinstance(clause, SelectBase):
+            if self.__replica is None:
+                self.__replica = self.__replicas.pick()
+            return self.__replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
 
 
 class DBStorage:
@@ -16,44 +126,71 @@ class DBStorage:
         Create SQLalchemy database
     '''
     __engine = None
+    __replicas = None
     __session = None
 
-    def __init__(self):
+    def __init__(self, engine=None, replicas=None):
         '''
             Create engine and link to MySQL databse (hbnb_dev, hbnb_dev_db)
+            Arguments:
+                engine : engine to use instead of MySQL (optional).
+                replicas : engines of read replicas of engine (optional),
+                           by default the MySQL hosts listed in
+                           HBNB_MYSQL_REPLICA_HOSTS when engine is None.
         '''
-        user = getenv("HBNB_MYSQL_USER")
-        pwd = getenv("HBNB_MYSQL_PWD")
-        host = getenv("HBNB_MYSQL_HOST")
-        db = getenv("HBNB_MYSQL_DB")
         envv = getenv("HBNB_ENV", "none")
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.format(
-            user, pwd, host, db), pool_pre_ping=True)
+        if engine is None:
+            engine = self.__mysql_engine(getenv("HBNB_MYSQL_HOST"))
+            if replicas is None:
+                hosts = getenv("HBNB_MYSQL_REPLICA_HOSTS", "")
+                replicas = [self.__mysql_engine(host)
+                            for host in hosts.split(",") if host]
+        self.__engine = engine
+        if replicas:
+            self.__replicas = _Replicas(
+                replicas, getenv("HBNB_REPLICA_BALANCE", "round_robin"))
         if envv == 'test':
+            # replicas follow the primary; DDL never runs on them
             Base.metadata.drop_all(self.__engine)
 
     def all(self, cls=None):
         '''
             Query current database session
         '''
-        db_dict = {}
+        return dict(self.iter_all(cls))
 
-        if cls is not None and cls != '':
-            objs = self.__session.query(models.classes[cls]).all()
-            for obj in objs:
-                key = "{}.{}".format(obj.__class__.__name__, obj.id)
-                db_dict[key] = obj
-            return db_dict
+    def iter_all(self, cls=None, batch_size=1000):
+        '''
+            Yield the (key, object) pairs of all() one table at a time,
+            batch_size rows per query in id order. Each batch is read in
+            full before it is handed out, so the caller may run other
+            queries between rows; a streaming cursor left open would
+            put MySQL out of sync.
+            Arguments:
+                cls : class, class name or list of them (optional).
+                batch_size : rows read per query.
+        '''
+        if cls is None or cls == '':
+            classes = [v for k, v in models.classes.items()
+                       if k != "BaseModel"]
+        elif isinstance(cls, (list, tuple, set, frozenset)):
+            classes = [self.__class_of(one) for one in cls]
         else:
-            for k, v in models.classes.items():
-                if k != "BaseModel":
-                    objs = self.__session.query(v).all()
-                    if len(objs) > 0:
-                        for obj in objs:
-                            key = "{}.{}".format(obj.__class__.__name__,
-                                                 obj.id)
-                            db_dict[key] = obj
-            return db_dict
+            classes = [self.__class_of(cls)]
+        for model in classes:
+            if model is None:
+                continue
+            prefix = model.__name__ + "."
+            query = self.__session.query(model).order_by(model.id)
+            batch = query.limit(batch_size).all()
+            while batch:
+                for obj in batch:
+                    yield prefix + obj.id, obj
+                if len(batch) < batch_size:
+                    break
+                # keyset paging: the next batch starts after the last id
+                batch = query.filter(model.id > batch[-1].id).limit(
+                    batch_size).all()
 
     def new(self, obj):
         '''
@@ -61,12 +198,74 @@ class DBStorage:
         '''
         self.__session.add(obj)
 
-    def save(self):
+    def new_many(self, objs, batch_size=10000):
+        '''
+            Add every object of objs and commit them at once; the
+            inserts go out batch_size rows at a time as executemany
+        '''
+        batch = []
+        for obj in objs:
+            batch.append(obj)
+            if len(batch) == batch_size:
+                self.__add_batch(batch)
+                batch = []
+        self.__add_batch(batch)
+        self.__session.commit()
+
+    def update_many(self, cls, changes):
         '''
-            Commit all changes of current database session
+            Set new column values on rows of a class with executemany
+            UPDATEs by primary key, refresh their updated_at and commit
+            Arguments:
+                cls : class or class name of the objects.
+                changes : dict of object ID to a dict of the columns to
+                          set; IDs not stored are skipped.
+            Raises ValueError if changes would set id or __class__.
         '''
+        cls = self.__class_of(cls)
+        if cls is None or not changes:
+            return
+        for attrs in changes.values():
+            if "id" in attrs or "__class__" in attrs:
+                raise ValueError("update_many cannot change id or __class__")
+        now = datetime.now()
+        groups = {}
+        for obj_id, attrs in changes.items():
+            row = dict(attrs, updated_at=now, b_id=obj_id)
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        table = cls.__table__
+        for names, rows in groups.items():
+            # rows setting the same columns share one statement
+            statement = table.update().where(
+                table.c.id == bindparam("b_id")).values(
+                {name: bindparam(name) for name in names if name != "b_id"})
+            self.__session.execute(statement, rows)
+        # loaded objects take the new values as their committed state;
+        # expiring them would leave them unreadable once detached
+        for obj in list(self.__session.identity_map.values()):
+            if isinstance(obj, cls) and obj.id in changes:
+                for name, value in changes[obj.id].items():
+                    set_committed_value(obj, name, value)
+                set_committed_value(obj, "updated_at", now)
         self.__session.commit()
 
+    def touch(self, obj):
+        '''
+            Nothing to do: the session tracks changed attributes, and
+            the full-text indexes are kept by the database
+        '''
+
+    def save(self):
+        '''
+            Commit all changes of current database session; a failed
+            commit is rolled back so the session can be used again
+        '''
+        try:
+            self.__session.commit()
+        except Exception:
+            self.__session.rollback()
+            raise
+
     def delete(self, obj=None):
         '''
             Delete from current database session
@@ -76,44 +275,487 @@ class DBStorage:
 
     def reload(self):
         '''
-            Commit all changes of current database session
+            Create the tables on the primary and the session registry;
+            every thread gets its own session from it. The replicas get
+            their schema from the primary by replication.
         '''
-        self.__session = Base.metadata.create_all(self.__engine)
-        factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
-        Session = scoped_session(factory)
-        self.__session = Session()
+        Base.metadata.create_all(self.__engine)
+        # create_all leaves the tables that already exist alone
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.__engine, checkfirst=True)
+        self.__create_fulltext()
+        factory = sessionmaker(bind=self.__engine, class_=_RoutedSession,
+                               replicas=self.__replicas,
+                               expire_on_commit=False)
+        self.__session = scoped_session(factory)
 
     def close(self):
         '''
-            Remove private session attribute
+            Remove the session of the current thread, giving its
+            connection back to the pool
+        '''
+        self.__session.remove()
+
+    def pool_stats(self):
+        '''
+        gets the state of the connection pools
+        Returns:
+            dict of the pool size, the connections checked in and out
+            and the overflow connections open, with the same for each
+            read replica under "replicas" if there are any
         '''
-        self.__session.close()
+        stats = _pool_stats(self.__engine)
+        if self.__replicas is not None:
+            stats["replicas"] = [_pool_stats(engine)
+                                 for engine in self.__replicas.engines]
+        return stats
 
-    def get(self, cls, id):
+    def explain(self):
+        '''
+        runs EXPLAIN on the queries the API and the web pages issue
+        and finds the ones reading a whole table
+        Returns:
+            list of dicts with the "sql" of each query, its "plan" and
+            the tables it scans in full under "full_scans"
+        '''
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, many):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((conn.engine, statement, parameters))
+
+        engines = self.__engines()
+        for bind in engines:
+            event.listen(bind, "before_cursor_execute", capture)
+        try:
+            self.__probe()
+        finally:
+            for bind in engines:
+                event.remove(bind, "before_cursor_execute", capture)
+        report = []
+        seen = set()
+        # sqlite3 caches prepared statements by their text, and a cached
+        # EXPLAIN is not prepared again when the indexes change
+        run = "\n-- explain {}".format(next(_EXPLAINS))
+        for engine, statement, parameters in captured:
+            if statement in seen:
+                continue
+            seen.add(statement)
+            with engine.connect() as connection:
+                if engine.dialect.name == "sqlite":
+                    rows = connection.exec_driver_sql(
+                        "EXPLAIN QUERY PLAN " + statement + run, parameters)
+                    plan = [row[-1] for row in rows]
+                    scans = [match.group(1) for match in
+                             map(_SQLITE_SCAN.match, plan) if match]
+                else:
+                    rows = [row._mapping for row in connection.exec_driver_sql(
+                        "EXPLAIN " + statement, parameters)]
+                    plan = ["{} {} {}".format(row["table"], row["type"],
+                                              row["key"]) for row in rows]
+                    scans = [row["table"] for row in rows
+                             if row["type"] == "ALL"]
+            report.append({"sql": statement, "plan": plan,
+                           "full_scans": scans})
+        return report
+
+    def get(self, cls, id, load=None):
         '''
         gets an object
         Args:
-            cls (str): class name
+            cls (str): class or class name
             id (str): object ID
+            load: relationships to load with the object, as in query()
         Returns:
             an object based on class name and its ID
         '''
-        obj_dict = models.storage.all(cls)
-        for k, v in obj_dict.items():
-            matchstring = cls + '.' + id
-            if k == matchstring:
-                return v
+        cls = self.__class_of(cls)
+        if cls is None:
+            return None
+        return self.__session.get(cls, id, options=self.__options(cls, load))
+
+    def lookup(self, cls, attr, value):
+        '''
+        gets the objects of a class that refer to another object
+        Args:
+            cls (str): class or class name
+            attr (str): foreign key attribute, e.g. "state_id"
+            value (str): ID the attribute must be equal to
+        Returns:
+            list of the matching objects
+        '''
+        return self.query(cls, where={attr: value})
+
+    def query(self, cls, where=None, order_by=None, limit=None,
+              offset=None, load=None):
+        '''
+        gets the objects of a class that match where, sorted and sliced
+        by the database
+        Args:
+            cls (str): class or class name
+            where (dict): column values the objects must have; a list,
+                tuple or set matches any of its values, or all of them
+                for amenity_ids, and a dict of "gt", "gte", "lt" and
+                "lte" bounds matches the values within them
+            order_by (str or list): columns to sort on, descending when
+                prefixed with "-"
+            limit (int): most objects to return
+            offset (int): matching objects to skip first
+            load (str, list or dict): relationships to load along with
+                the objects, such as "cities" or "places.user", by one
+                more query per relationship; a dict maps each of them to
+                "selectin" or "joined" to load it in the same query
+        Returns:
+            list of the matching objects
+        '''
+        cls = self.__class_of(cls)
+        if cls is None:
+            return []
+        query = self.__session.query(cls).options(
+            *self.__options(cls, load))
+        for attr, value in (where or {}).items():
+            many = isinstance(value, (list, tuple, set, frozenset))
+            if attr == "amenity_ids":
+                if value or not many:
+                    query = query.filter(cls.id.in_(self.__having_amenities(
+                        value if many else [value])))
+            elif not hasattr(cls, attr):
+                return []
+            elif isinstance(value, dict):
+                for op, bound in value.items():
+                    if op not in _RANGES:
+                        raise ValueError(
+                            "Unknown range condition: {}".format(op))
+                    query = query.filter(_RANGES[op](getattr(cls, attr),
+                                                     bound))
+            elif many:
+                query = query.filter(getattr(cls, attr).in_(list(value)))
+            else:
+                query = query.filter(getattr(cls, attr) == value)
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        for name in order_by or []:
+            column = getattr(cls, name.lstrip("-"))
+            query = query.order_by(column.desc() if name.startswith("-")
+                                   else column)
+        if not order_by and (offset or limit is not None):
+            # pages need a stable order
+            query = query.order_by(cls.id)
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
-        return None
+    def get_many(self, cls, ids, load=None):
+        '''
+        gets several objects of the same class in one query
+        Args:
+            cls (str): class or class name
+            ids (list): object IDs
+            load: relationships to load with the objects, as in query()
+        Returns:
+            list of the objects found, in the order of ids
+        '''
+        cls = self.__class_of(cls)
+        ids = list(ids)
+        if cls is None or not ids:
+            return []
+        objs = self.__session.query(cls).options(
+            *self.__options(cls, load)).filter(cls.id.in_(ids)).all()
+        by_id = {obj.id: obj for obj in objs}
+        return [by_id[id] for id in ids if id in by_id]
 
     def count(self, cls=None):
         '''
         counts number of objects of a class (if given)
         Args:
-            cls (str): class name
+            cls (str): class or class name
         Returns:
             number of objects in class, if no class name given
             return total number of objects in database
         '''
-        obj_dict = models.storage.all(cls)
-        return len(obj_dict)
+        if cls is None or cls == '':
+            classes = [v for k, v in models.classes.items()
+                       if k != "BaseModel"]
+        else:
+            classes = [self.__class_of(cls)]
+        total = 0
+        for model in classes:
+            if model is not None:
+                total += self.__session.query(func.count(model.id)).scalar()
+        return total
+
+    def search(self, text, cls=None, limit=10):
+        '''
+        ranks the places and reviews whose text matches words of text,
+        with the full-text indexes of the database: BM25 over FTS5 on
+        SQLite, natural language FULLTEXT search on MySQL, which only
+        sees committed rows and skips its stopwords and short words
+        Args:
+            text (str): words to look for
+            cls (str): class or class name to search, all if None
+            limit (int): most objects to return
+        Returns:
+            list of the matching objects, best match first
+        '''
+        if cls is None:
+            classes = list(SearchIndex.fields)
+        else:
+            classes = [cls if isinstance(cls, str) else cls.__name__]
+        found = []
+        for name in classes:
+            if name in SearchIndex.fields:
+                found.extend(self.__fulltext(name, text, limit))
+        found.sort(key=lambda row: row[0], reverse=True)
+        found = found[:limit]
+        ids = {}
+        for score, name, obj_id in found:
+            ids.setdefault(name, []).append(obj_id)
+        objs = {}
+        for name, obj_ids in ids.items():
+            for obj in self.get_many(name, obj_ids):
+                objs[self.__key(obj)] = obj
+        return [objs[name + "." + obj_id] for score, name, obj_id in found
+                if name + "." + obj_id in objs]
+
+    def reindex(self):
+        '''
+            Rebuilds the full-text indexes from their tables. Only
+            SQLite needs it, after a VACUUM, which may renumber the
+            rowids its FTS5 tables point at.
+        '''
+        if self.__engine.dialect.name != "sqlite":
+            return
+        with self.__engine.begin() as connection:
+            for name in SearchIndex.fields:
+                table = models.classes[name].__tablename__
+                connection.execute(sql_text(_SQLITE_FULLTEXT[-1].format(
+                    table=table)))
+
+    def near(self, lat, lng, radius, limit=None):
+        '''
+        gets the places within radius kilometers of a point; the
+        database only returns the places in the bounding box
+        Args:
+            lat (float): latitude of the point, in degrees
+            lng (float): longitude of the point, in degrees
+            radius (float): distance in kilometers
+            limit (int): most places to return
+        Returns:
+            list of the places, nearest first
+        '''
+        found = []
+        for place in self.__box(*bounding_box(lat, lng, radius)):
+            dist = distance(lat, lng, place.latitude, place.longitude)
+            if dist <= radius:
+                found.append((dist, place))
+        found.sort(key=lambda dp: dp[0])
+        return [place for dist, place in found[:limit]]
+
+    def within(self, south, west, north, east, limit=None):
+        '''
+        gets the places inside a latitude and longitude box, which
+        crosses the antimeridian when west is greater than east
+        Args:
+            south, west, north, east (float): edges of the box
+            limit (int): most places to return
+        Returns:
+            list of the places
+        '''
+        query = self.__box(south, west, north, east)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def __box(self, south, west, north, east):
+        '''
+            Return the query of the places inside a box
+        '''
+        place = models.classes["Place"]
+        query = self.__session.query(place).filter(
+            place.latitude.between(south, north))
+        if west > east:
+            return query.filter(or_(place.longitude >= west,
+                                    place.longitude <= east))
+        return query.filter(place.longitude.between(west, east))
+
+    def __having_amenities(self, amenity_ids):
+        '''
+            Return the select of the ids of the places linked to every
+            one of amenity_ids, from place_amenity alone
+        '''
+        link = models.place.place_amenity
+        amenity_ids = set(amenity_ids)
+        return select(link.c.place_id).where(
+            link.c.amenity_id.in_(amenity_ids)).group_by(
+            link.c.place_id).having(
+            func.count(link.c.amenity_id) == len(amenity_ids))
+
+    def __probe(self):
+        '''
+            Issue the queries of the API and the web pages once each,
+            for values no row has
+        '''
+        for name, model in models.classes.items():
+            if name != "BaseModel":
+                self.get(model, _PROBE)
+        for name, attr in (("City", "state_id"), ("Place", "city_id"),
+                           ("Place", "user_id"), ("Review", "place_id"),
+                           ("Review", "user_id"), ("User", "email")):
+            self.query(name, where={attr: _PROBE})
+        for name in ("State", "City", "Amenity", "Place"):
+            self.query(name, order_by="name", limit=10)
+        self.query("Place", order_by="-updated_at", limit=10)
+        self.query("Place", where={"price_by_night": {"gte": 0, "lte": 1}},
+                   order_by="price_by_night", limit=10)
+        self.query("Place", where={"amenity_ids": [_PROBE]}, limit=10)
+        self.near(0.0, 0.0, 1.0, limit=10)
+
+    def __engines(self):
+        '''
+            Return the primary engine and the replica engines
+        '''
+        if self.__replicas is None:
+            return [self.__engine]
+        return [self.__engine] + self.__replicas.engines
+
+    def __mysql_engine(self, host):
+        '''
+            Return the engine of the MySQL database on host, with the
+            credentials and pool set in the HBNB_MYSQL_* environment
+            variables
+        '''
+        user = getenv("HBNB_MYSQL_USER")
+        pwd = getenv("HBNB_MYSQL_PWD")
+        db = getenv("HBNB_MYSQL_DB")
+        pool = {"pool_recycle": int(getenv("HBNB_MYSQL_POOL_RECYCLE", 3600))}
+        for option, var in (("pool_size", "HBNB_MYSQL_POOL_SIZE"),
+                            ("max_overflow", "HBNB_MYSQL_MAX_OVERFLOW"),
+                            ("pool_timeout", "HBNB_MYSQL_POOL_TIMEOUT")):
+            if getenv(var) is not None:
+                pool[option] = int(getenv(var))
+        return create_engine('mysql+mysqldb://{}:{}@{}/{}'.format(
+            user, pwd, host, db), pool_pre_ping=True, **pool)
+
+    def __add_batch(self, objs):
+        '''
+            Add objs to the session and flush them
+        '''
+        if not objs:
+            return
+        self.__session.add_all(objs)
+        self.__session.flush()
+
+    def __options(self, cls, load):
+        '''
+            Return the loader options of cls for load, a relationship
+            path, a list of them or a dict of them to strategies
+        '''
+        if not load:
+            return []
+        if isinstance(load, str):
+            load = [load]
+        if not isinstance(load, dict):
+            load = dict.fromkeys(load, "selectin")
+        options = []
+        for path, strategy in load.items():
+            if strategy not in _LOADERS:
+                raise ValueError(
+                    "Unknown loading strategy: {}".format(strategy))
+            option = None
+            model = cls
+            for name in path.split("."):
+                attr = getattr(model, name, None)
+                if not isinstance(getattr(attr, "property", None),
+                                  RelationshipProperty):
+                    raise ValueError("{} has no relationship {}".format(
+                        model.__name__, name))
+                if option is None:
+                    option = _LOADERS[strategy](attr)
+                else:
+                    option = getattr(option, strategy + "load")(attr)
+                model = attr.property.mapper.class_
+            options.append(option)
+        return options
+
+    def __create_fulltext(self):
+        '''
+            Create the missing full-text indexes over the columns of
+            SearchIndex.fields: FTS5 tables on SQLite, filled from the
+            rows already there, and FULLTEXT indexes on MySQL
+        '''
+        dialect = self.__engine.dialect.name
+        with self.__engine.begin() as connection:
+            for name, fields in SearchIndex.fields.items():
+                table = models.classes[name].__tablename__
+                if dialect == "sqlite":
+                    found = connection.execute(sql_text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' "
+                        "AND name = :name"), {"name": table + "_fts_insert"})
+                    if found.first() is not None:
+                        continue
+                    names = {"table": table, "columns": ", ".join(fields),
+                             "new": ", ".join("new." + f for f in fields),
+                             "old": ", ".join("old." + f for f in fields)}
+                    for statement in _SQLITE_FULLTEXT:
+                        connection.execute(sql_text(statement.format(
+                            **names)))
+                elif dialect == "mysql":
+                    indexes = inspect(connection).get_indexes(table)
+                    if "ft_" + table in [index["name"] for index in indexes]:
+                        continue
+                    connection.execute(sql_text(
+                        "CREATE FULLTEXT INDEX ft_{0} ON {0} ({1})".format(
+                            table, ", ".join(fields))))
+
+    def __fulltext(self, name, words, limit):
+        '''
+            Return the (score, class name, id) of the objects of class
+            name best matching words, best first
+        '''
+        table = models.classes[name].__tablename__
+        if self.__engine.dialect.name == "sqlite":
+            terms = set(_WORD.findall(words.lower())) if words else set()
+            if not terms:
+                return []
+            # quoted, the words are never read as FTS5 operators
+            query = " OR ".join('"{}"'.format(term) for term in terms)
+            statement = (
+                "SELECT t.id, -bm25({0}_fts) AS score FROM {0}_fts "
+                "JOIN {0} t ON t.rowid = {0}_fts.rowid "
+                "WHERE {0}_fts MATCH :query "
+                "ORDER BY bm25({0}_fts) LIMIT :limit").format(table)
+        else:
+            if not words:
+                return []
+            query = words
+            statement = (
+                "SELECT id, MATCH ({1}) AGAINST (:query) AS score FROM {0} "
+                "WHERE MATCH ({1}) AGAINST (:query) "
+                "ORDER BY score DESC LIMIT :limit").format(
+                    table, ", ".join(SearchIndex.fields[name]))
+        # with its columns given the text is a SELECT, which may go to
+        # a replica
+        statement = sql_text(statement).columns(id=String, score=Float)
+        rows = self.__session.execute(statement,
+                                      {"query": query, "limit": limit})
+        return [(score, name, obj_id) for obj_id, score in rows]
+
+    def __key(self, obj):
+        '''
+            Return the "<class name>.<id>" key of obj
+        '''
+        return obj.__class__.__name__ + "." + str(obj.id)
+
+    def __class_of(self, cls):
+        '''
+            Return the mapped class for cls, a class or a class name,
+            or None if it has no table, as BaseModel
+        '''
+        if isinstance(cls, str):
+            cls = models.classes.get(cls)
+        if not hasattr(cls, "__table__"):
+            return None
+        return cls
@@ -2,32 +2,419 @@
 '''
     Define class FileStorage
 '''
+import atexit
+import heapq
 import json
+import operator
+import os
+import tempfile
+import threading
+import zlib
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+from bisect import bisect_left
+from itertools import islice, takewhile
+from types import SimpleNamespace
+from os import getenv
 import models
+from models.engine.bitmap_index import BitmapIndex
+from models.engine.geo_index import GeoIndex
+from models.engine.search_index import SearchIndex
+from models.engine.sorted_index import SortedIndex
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_RANGES = {"gt": operator.gt, "gte": operator.ge,
+           "lt": operator.lt, "lte": operator.le}
+
+
+def _class_name(cls):
+    '''
+        Return the class name for cls, which may be a class or a string.
+    '''
+    if cls is None or isinstance(cls, str):
+        return cls
+    return cls.__name__
+
+
+def _iter_json_object(fd, chunk_size=64 * 1024):
+    '''
+        Yield the (key, value) pairs of the JSON object in file fd one
+        at a time, reading it in chunks so the whole document is never
+        held in memory.
+    '''
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        '''
+            Drop the consumed text and read the next chunk
+        '''
+        nonlocal buf, pos, eof
+        chunk = fd.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip_ws():
+        '''
+            Move pos past whitespace, reading more text as needed
+        '''
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    def expect(chars):
+        '''
+            Consume and return the next character, one of chars
+        '''
+        nonlocal pos
+        skip_ws()
+        if pos >= len(buf) or buf[pos] not in chars:
+            raise ValueError("Expecting one of {!r} at offset {}".format(
+                chars, pos))
+        pos += 1
+        return buf[pos - 1]
+
+    def decode():
+        '''
+            Decode the next JSON value, reading more text until it is
+            complete
+        '''
+        nonlocal pos
+        skip_ws()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if end == len(buf) and not eof:
+                fill()
+                continue
+            pos = end
+            return value
+
+    expect("{")
+    skip_ws()
+    if pos < len(buf) and buf[pos] == "}":
+        return
+    while True:
+        key = decode()
+        expect(":")
+        yield key, decode()
+        if expect(",}") == "}":
+            return
+
+
+def _iter_snapshot(fd, fmt):
+    '''
+        Yield the (key, dict) pairs stored in the snapshot file fd,
+        written in format fmt ("json" or "ndjson").
+    '''
+    if fmt != "ndjson":
+        yield from _iter_json_object(fd)
+        return
+    for line in fd:
+        if line.strip():
+            val = json.loads(line)
+            yield val["__class__"] + "." + val["id"], val
+
+
+def _dump_snapshot(fd, items, fmt):
+    '''
+        Write the (key, JSON text) pairs of items to fd in format fmt,
+        one entry at a time.
+    '''
+    if fmt == "ndjson":
+        for key, text in items:
+            fd.write(text + "\n")
+        return
+    fd.write("{")
+    sep = ""
+    for key, text in items:
+        fd.write(sep + json.dumps(key) + ": " + text)
+        sep = ", "
+    fd.write("}")
+
+
+def _file_stat(path):
+    '''
+        Return what identifies a version of the file at path, or None.
+    '''
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _values(value):
+    '''
+        Return value as a list if it stands for several values, or None.
+    '''
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return None
+
+
+def _check_range(bounds):
+    '''
+        Raise ValueError if bounds holds other keys than those of
+        _RANGES.
+    '''
+    for op in bounds:
+        if op not in _RANGES:
+            raise ValueError("Unknown range condition: {}".format(op))
+
+
+def _in_range(value, bounds):
+    '''
+        Return True if value is within bounds, a dict of "gt", "gte",
+        "lt" and "lte" limits.
+    '''
+    if value is None:
+        return False
+    try:
+        return all(_RANGES[op](value, bound) for op, bound in bounds.items())
+    except TypeError:
+        return False
+
+
+def _matches(obj, where):
+    '''
+        Return True if obj has the attribute values given in where.
+    '''
+    for attr, value in where.items():
+        have = getattr(obj, attr, None)
+        values = _values(value)
+        if isinstance(value, dict):
+            if not _in_range(have, value):
+                return False
+        elif isinstance(have, list):
+            if not set(have).issuperset(values or [value]):
+                return False
+        elif values is None:
+            if have != value:
+                return False
+        elif have not in values:
+            return False
+    return True
+
+
+def _sort_key(attr):
+    '''
+        Return a sort key on attr that puts missing values last.
+    '''
+    def key(obj):
+        value = getattr(obj, attr, None)
+        return (value is None, value)
+    return key
+
+
+def _amenity_ids(obj):
+    '''
+        Return the amenity_ids of a place, an instance or its parsed dict.
+    '''
+    if type(obj) is dict:
+        return obj.get("amenity_ids")
+    return getattr(obj, "amenity_ids", None)
+
+
+def _merged(refs, values):
+    '''
+        Return the keys of the __refs buckets refs[value] of values.
+    '''
+    keys = {}
+    for value in values:
+        keys.update(refs.get(value, {}))
+    return keys
+
+
+def _with_prefix(keys, prefix):
+    '''
+        Return an iterator over the keys of the sorted list keys that
+        start with prefix, found by binary search.
+    '''
+    start = bisect_left(keys, prefix)
+    return takewhile(lambda key: key.startswith(prefix),
+                     (keys[i] for i in range(start, len(keys))))
+
+
+def _rank_value(obj, attr):
+    '''
+        Return the value of attr of a place, an instance or its parsed
+        dict, falling back to the Place default missing from the dict.
+    '''
+    if type(obj) is not dict:
+        return getattr(obj, attr, None)
+    if attr in obj:
+        return obj[attr]
+    return getattr(models.classes["Place"], attr, None)
+
+
+class _RWLock:
+    '''
+        Lock held by any number of readers or by a single writer.
+        Waiting writers go before new readers so they are not starved,
+        a thread may take the read lock again while it holds it, and
+        the writer may take either lock again.
+    '''
+
+    def __init__(self):
+        self.__cond = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = None
+        self.__waiting = 0
+        self.__local = threading.local()
+
+    @contextmanager
+    def reading(self):
+        '''
+            Hold the lock shared for the body of a with statement
+        '''
+        depth = getattr(self.__local, "depth", 0)
+        nested = depth > 0 or self.__writer == threading.get_ident()
+        if not nested:
+            with self.__cond:
+                while self.__writer is not None or self.__waiting:
+                    self.__cond.wait()
+                self.__readers += 1
+        self.__local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self.__local.depth = depth
+            if not nested:
+                with self.__cond:
+                    self.__readers -= 1
+                    if not self.__readers:
+                        self.__cond.notify_all()
+
+    @contextmanager
+    def writing(self):
+        '''
+            Hold the lock exclusively for the body of a with statement
+        '''
+        me = threading.get_ident()
+        if self.__writer == me:
+            yield
+            return
+        if getattr(self.__local, "depth", 0):
+            raise RuntimeError("cannot upgrade a read lock to a write lock")
+        with self.__cond:
+            self.__waiting += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__cond.wait()
+            finally:
+                self.__waiting -= 1
+            self.__writer = me
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__writer = None
+                self.__cond.notify_all()
 
 
 class FileStorage:
     '''
         Serializes instances to JSON file and deserializes to JSON file.
+        The HBNB_FS_* settings it reads are described in the README.
     '''
     __file_path = "file.json"
     __objects = {}
+    # the objects of __objects again, partitioned by class name
+    __classes = {}
+    __journal = getenv("HBNB_FS_JOURNAL", "0") == "1"
+    __journal_limit = int(getenv("HBNB_FS_JOURNAL_LIMIT", 1024 * 1024))
+    # keys changed or deleted since the last write
+    __dirty = set()
+    __deleted = set()
+    __commit_window = int(getenv("HBNB_FS_GROUP_COMMIT_MS", 0)) / 1000.0
+    __shared = getenv("HBNB_FS_SHARED", "0") == "1"
+    # readers share __rwlock and writers hold it alone; __io_lock
+    # serializes the file writes
+    __rwlock = _RWLock()
+    __io_lock = threading.RLock()
+    __hydrate_lock = threading.Lock()
+    __timer = None
+    # the version of the files __objects reflects
+    __snapshot_stat = None
+    __journal_offset = 0
+    __lazy = getenv("HBNB_FS_LAZY", "0") == "1"
+    # partitions that may still hold parsed dicts in lazy mode
+    __lazy_classes = set()
+    __format = getenv("HBNB_FS_FORMAT", "json")
+    __shard_dir = getenv("HBNB_FS_SHARD_DIR")
+    __shards = int(getenv("HBNB_FS_SHARDS", 1))
+    __load_workers = int(getenv("HBNB_FS_LOAD_WORKERS", 1))
+    __dirty_shards = set()
+    # JSON text of the objects unchanged since they were written
+    __serialized = {}
+    __ref_attrs = ("state_id", "city_id", "place_id", "user_id")
+    # __refs[attr][value] holds the keys of the objects whose attr is
+    # value, and __id_order sorted copies of these and of __classes
+    __refs = {}
+    __id_order = {}
+    __ref_values = {}
+    # indexes behind search(), near() and within(), amenity_ids and
+    # the numeric range conditions of query()
+    __search = SearchIndex()
+    __geo = GeoIndex()
+    __amenities = BitmapIndex()
+    __ranges = {"price_by_night": SortedIndex(), "max_guest": SortedIndex(),
+                "number_rooms": SortedIndex(),
+                "number_bathrooms": SortedIndex()}
 
     def all(self, cls=None):
         '''
             Return the dictionary
+            Arguments:
+                cls : class or class name to filter on (optional).
         '''
-        new_dict = {}
-        if cls is None:
-            return self.__objects
+        if isinstance(cls, (list, tuple, set, frozenset)):
+            return dict(self.iter_all(cls))
+        cls = _class_name(cls)
+        with FileStorage.__rwlock.reading():
+            if cls is None or cls == "":
+                for cls_name in list(FileStorage.__lazy_classes):
+                    self.__hydrate_class(cls_name)
+                return dict(FileStorage.__objects)
+            if cls in FileStorage.__lazy_classes:
+                self.__hydrate_class(cls)
+            return dict(FileStorage.__classes.get(cls, {}))
 
-        if cls != "":
-            for k, v in self.__objects.items():
-                if cls == k.split(".")[0]:
-                    new_dict[k] = v
-            return new_dict
-        else:
-            return self.__objects
+    def iter_all(self, cls=None):
+        '''
+            Yield the (key, object) pairs of all() one class at a time,
+            so a caller can go through them without one dictionary of
+            every object
+            Arguments:
+                cls : class, class name or list of them (optional).
+        '''
+        if not isinstance(cls, (list, tuple, set, frozenset)):
+            yield from self.all(cls).items()
+            return
+        for one in cls:
+            yield from self.all(one).items()
 
     def new(self, obj):
         '''
@@ -35,75 +422,910 @@ class FileStorage:
             Aguments:
                 obj : An instance object.
         '''
-        key = str(obj.__class__.__name__) + "." + str(obj.id)
-        value_dict = obj
-        FileStorage.__objects[key] = value_dict
+        key = obj.__class__.__name__ + "." + str(obj.id)
+        with FileStorage.__rwlock.writing():
+            self.__put(FileStorage, key, obj)
+            self.__mark(key)
+
+    def new_many(self, objs):
+        '''
+            Adds every object of objs and saves them with one write
+            Aguments:
+                objs : iterable of instance objects.
+        '''
+        with FileStorage.__rwlock.writing():
+            for obj in objs:
+                key = obj.__class__.__name__ + "." + str(obj.id)
+                self.__put(FileStorage, key, obj)
+                self.__mark(key)
+        self.save()
+
+    def update_many(self, cls, changes):
+        '''
+            Sets new attribute values on stored objects of a class,
+            refreshes their updated_at and saves them with one write
+            Aguments:
+                cls : class or class name of the objects.
+                changes : dict of object ID to a dict of the attributes
+                          to set; IDs not stored are skipped.
+            Raises ValueError if changes would set id or __class__.
+        '''
+        for attrs in changes.values():
+            if "id" in attrs or "__class__" in attrs:
+                raise ValueError("update_many cannot change id or __class__")
+        prefix = _class_name(cls) + "."
+        now = datetime.now()
+        with FileStorage.__rwlock.writing():
+            for obj_id, attrs in changes.items():
+                key = prefix + str(obj_id)
+                obj = self.__hydrate(key)
+                if obj is None:
+                    continue
+                # __put below does the indexing setattr would via touch
+                obj.__dict__.update(attrs)
+                obj.__dict__["updated_at"] = now
+                self.__put(FileStorage, key, obj)
+                self.__mark(key)
+        self.save()
+
+    def touch(self, obj):
+        '''
+            Marks a stored obj as changed so the next save() writes it
+            Aguments:
+                obj : An instance object.
+        '''
+        obj_id = obj.__dict__.get("id")
+        if obj_id is None:
+            return
+        key = obj.__class__.__name__ + "." + str(obj_id)
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        with FileStorage.__rwlock.writing():
+            if FileStorage.__objects.get(key) is obj:
+                self.__mark(key)
+                self.__index(FileStorage, key, obj)
+                FileStorage.__search.add(key, obj)
+                FileStorage.__geo.add(key, obj)
+                self.__rank(FileStorage, key, obj)
+                self.__link(FileStorage, key, obj)
 
     def save(self):
         '''
-            Serializes __objects attribute to JSON file.
+            Serializes __objects attribute to JSON file, or appends the
+            pending changes to the journal in journal mode.
+            In group commit mode the write is deferred to the flusher.
+        '''
+        if FileStorage.__commit_window <= 0:
+            self.__write()
+            return
+        with FileStorage.__io_lock:
+            if FileStorage.__timer is None:
+                timer = threading.Timer(FileStorage.__commit_window,
+                                        self.flush)
+                timer.daemon = True
+                FileStorage.__timer = timer
+                timer.start()
+
+    def flush(self):
+        '''
+            Writes out any save() still waiting for the group commit.
         '''
-        objects_dict = {}
-        for key, val in FileStorage.__objects.items():
-            objects_dict[key] = val.to_dict()
+        with FileStorage.__io_lock:
+            timer = FileStorage.__timer
+            if timer is None:
+                return
+            FileStorage.__timer = None
+            timer.cancel()
+            self.__write()
 
-        with open(FileStorage.__file_path, mode='w', encoding="UTF8") as fd:
-            json.dump(objects_dict, fd)
+    def compact(self, shards=None):
+        '''
+            Writes every object to the JSON file and drops the journal,
+            which the new snapshot supersedes.
+            Arguments:
+                shards : in sharded mode, the (class, partition) shards
+                         to rewrite instead of all of them.
+        '''
+        with FileStorage.__io_lock, self.__file_lock(True):
+            if FileStorage.__shared:
+                self.__catch_up()
+            with FileStorage.__rwlock.reading():
+                self.__compact(shards)
 
     def reload(self):
         '''
-            Deserializes the JSON file to __objects.
+            Deserializes the JSON file to __objects, then replays the
+            journal on top of it. Saves still waiting for the group
+            commit are written first, or the reload would drop them.
         '''
-        try:
-            with open(FileStorage.__file_path, encoding="UTF8") as fd:
-                FileStorage.__objects = json.load(fd)
-            for key, val in FileStorage.__objects.items():
-                class_name = val["__class__"]
-                class_name = models.classes[class_name]
-                FileStorage.__objects[key] = class_name(**val)
-        except FileNotFoundError:
-            pass
+        self.flush()
+        with FileStorage.__io_lock, self.__file_lock(False):
+            self.__reload(False)
 
     def delete(self, obj=None):
         '''
         Deletes an obj
         '''
         if obj is not None:
-            key = str(obj.__class__.__name__) + "." + str(obj.id)
-            FileStorage.__objects.pop(key, None)
+            key = obj.__class__.__name__ + "." + str(obj.id)
+            with FileStorage.__rwlock.writing():
+                self.__drop(FileStorage, key)
+                FileStorage.__dirty.discard(key)
+                FileStorage.__deleted.add(key)
+                FileStorage.__dirty_shards.add(self.__shard_of(key))
             self.save()
 
     def close(self):
         '''
-        Deserialize JSON file to objects
+        Brings __objects up to date with the files, if they changed
+        '''
+        with FileStorage.__io_lock:
+            if FileStorage.__timer is not None:
+                # unflushed changes would be lost by a reload
+                return
+            with self.__file_lock(False):
+                self.__catch_up()
+
+    def lookup(self, cls, attr, value):
+        '''
+        gets the objects of a class that refer to another object
+        Args:
+            cls (str): class or class name
+            attr (str): foreign key attribute, e.g. "state_id"
+            value (str): ID the attribute must be equal to
+        Returns:
+            list of the matching objects
+        '''
+        return self.query(cls, where={attr: value})
+
+    def query(self, cls, where=None, order_by=None, limit=None,
+              offset=None, load=None):
+        '''
+        gets the objects of a class that match where, sorted and sliced
+        Args:
+            cls (str): class or class name
+            where (dict): attribute values the objects must have; a list,
+                tuple or set matches any of its values, or all of them
+                for amenity_ids, and a dict of "gt", "gte", "lt" and
+                "lte" bounds matches the values within them
+            order_by (str or list): attributes to sort on, descending
+                when prefixed with "-"
+            limit (int): most objects to return
+            offset (int): matching objects to skip first
+            load: relationships to load with the objects; unused, the
+                relationships here are lookups on the indexes already
+        Returns:
+            list of the matching objects
+        '''
+        offset = offset or 0
+        stop = None if limit is None else offset + limit
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        order_by = list(order_by or [])
+        with FileStorage.__rwlock.reading():
+            # pages must not depend on set or dict order, so they come
+            # in id order like those of DBStorage
+            paging = not order_by and (offset or stop is not None)
+            keys, rest = self.__candidates(_class_name(cls), where or {},
+                                           stop if paging else False)
+            objs = (self.__hydrate(key) for key in keys)
+            objs = (obj for obj in objs
+                    if obj is not None and _matches(obj, rest))
+            if not order_by:
+                return list(islice(objs, offset, stop))
+            if len(order_by) == 1 and stop is not None:
+                name = order_by[0]
+                if name.startswith("-"):
+                    top = heapq.nlargest(stop, objs, _sort_key(name[1:]))
+                else:
+                    top = heapq.nsmallest(stop, objs, _sort_key(name))
+                return top[offset:]
+            objs = list(objs)
+            for name in reversed(order_by):
+                objs.sort(key=_sort_key(name.lstrip("-")),
+                          reverse=name.startswith("-"))
+            return objs[offset:stop]
+
+    def search(self, text, cls=None, limit=10):
+        '''
+        ranks the places and reviews whose text matches words of text
+        Args:
+            text (str): words to look for
+            cls (str): class or class name to search, all if None
+            limit (int): most objects to return
+        Returns:
+            list of the matching objects, best match first
+        '''
+        classes = None if cls is None else [_class_name(cls)]
+        with FileStorage.__rwlock.reading():
+            found = FileStorage.__search.search(text, classes, limit)
+            objs = (self.__hydrate(key) for key, score in found)
+            return [obj for obj in objs if obj is not None]
+
+    def near(self, lat, lng, radius, limit=None):
+        '''
+        gets the places within radius kilometers of a point
+        Args:
+            lat (float): latitude of the point, in degrees
+            lng (float): longitude of the point, in degrees
+            radius (float): distance in kilometers
+            limit (int): most places to return
+        Returns:
+            list of the places, nearest first
+        '''
+        with FileStorage.__rwlock.reading():
+            found = FileStorage.__geo.near(lat, lng, radius, limit)
+            return [self.__hydrate(key) for key, dist in found]
+
+    def within(self, south, west, north, east, limit=None):
+        '''
+        gets the places inside a latitude and longitude box, which
+        crosses the antimeridian when west is greater than east
+        Args:
+            south, west, north, east (float): edges of the box
+            limit (int): most places to return
+        Returns:
+            list of the places
         '''
-        self.reload()
+        with FileStorage.__rwlock.reading():
+            keys = FileStorage.__geo.within(south, west, north, east)
+            return [self.__hydrate(key) for key in keys[:limit]]
 
-    def get(self, cls, id):
+    def get(self, cls, id, load=None):
         '''
         gets an object
         Args:
-            cls (str): class name
+            cls (str): class or class name
             id (str): object ID
+            load: relationships to load with the object; unused
         Returns:
             an object based on class name and its ID
         '''
-        obj_dict = self.all(cls)
-        for k, v in obj_dict.items():
-            matchstring = cls + '.' + id
-            if k == matchstring:
-                return v
+        with FileStorage.__rwlock.reading():
+            return self.__hydrate(_class_name(cls) + "." + str(id))
 
-        return None
+    def get_many(self, cls, ids, load=None):
+        '''
+        gets several objects of the same class
+        Args:
+            cls (str): class or class name
+            ids (list): object IDs
+            load: relationships to load with the objects; unused
+        Returns:
+            list of the objects found, in the order of ids
+        '''
+        prefix = _class_name(cls) + "."
+        with FileStorage.__rwlock.reading():
+            found = (self.__hydrate(prefix + str(id)) for id in ids)
+            return [obj for obj in found if obj is not None]
 
     def count(self, cls=None):
         '''
         counts number of objects in a class (if given)
         Args:
-            cls (str): class name
+            cls (str): class or class name
         Returns:
             number of objects in class, if no class name given
             return total number of objects in database
         '''
-        obj_dict = self.all(cls)
-        return len(obj_dict)
+        cls = _class_name(cls)
+        with FileStorage.__rwlock.reading():
+            if cls is None or cls == "":
+                return len(FileStorage.__objects)
+            return len(FileStorage.__classes.get(cls, {}))
+
+    def __candidates(self, cls_name, where, stop=False):
+        '''
+            Return an iterator over the keys of cls_name that may match
+            where, narrowed by __refs for the foreign keys in it, by
+            __ranges for the numeric attributes and by __amenities for
+            amenity_ids, and the conditions left to check on the objects.
+            Unless stop is False the keys come in id order, and only
+            the first stop of them are needed if stop is not None.
+        '''
+        indexed = []
+        tokens = None
+        rest = {}
+        for attr, value in where.items():
+            if isinstance(value, dict):
+                _check_range(value)
+            if attr in FileStorage.__ranges and isinstance(value, dict):
+                indexed.append(FileStorage.__ranges[attr].range(**value))
+                continue
+            if attr == "amenity_ids" and not isinstance(value, dict):
+                values = _values(value)
+                if values is None:
+                    values = [value]
+                elif not values:
+                    # no amenity asked for, as in DBStorage
+                    continue
+                indexed.append(FileStorage.__amenities.all_of(values))
+                continue
+            if attr not in FileStorage.__ref_attrs or \
+                    isinstance(value, dict):
+                rest[attr] = value
+                continue
+            refs = FileStorage.__refs.get(attr, {})
+            values = _values(value)
+            if values is None:
+                indexed.append(refs.get(value, {}))
+                tokens = [(attr, value)]
+            else:
+                # merged only if the buckets cannot be read in id order
+                indexed.append(partial(_merged, refs, values))
+                tokens = [(attr, one) for one in dict.fromkeys(values)]
+        prefix = cls_name + "."
+        if stop is not False:
+            # the class partition and the __refs buckets are kept in
+            # id order, so a page only reads as far as it goes
+            if not indexed:
+                return self.__in_id_order([cls_name], prefix), rest
+            if len(indexed) == 1 and tokens is not None:
+                return self.__in_id_order(tokens, prefix), rest
+        indexed = [keys() if type(keys) is partial else keys
+                   for keys in indexed]
+        if not indexed:
+            keys = iter(FileStorage.__classes.get(cls_name, {}))
+        elif len(indexed) == 1:
+            keys = (key for key in indexed[0] if key.startswith(prefix))
+        else:
+            indexed = [keys if type(keys) is dict else dict.fromkeys(keys)
+                       for keys in indexed]
+            indexed.sort(key=len)
+            first, others = indexed[0], indexed[1:]
+            keys = (key for key in first if key.startswith(prefix) and
+                    all(key in keys for keys in others))
+        if stop is False:
+            return keys, rest
+        if stop is None or rest:
+            # candidates failing rest would leave a short page
+            return iter(sorted(keys)), rest
+        return iter(heapq.nsmallest(stop, keys)), rest
+
+    def __in_id_order(self, tokens, prefix):
+        '''
+            Return an iterator in id order over the keys starting with
+            prefix of the class partitions or __refs buckets named by
+            tokens, a class name or an (attr, value) pair each. Their
+            sorted keys are kept in __id_order until they change.
+        '''
+        found = []
+        for token in tokens:
+            if type(token) is str:
+                source = FileStorage.__classes.get(token, {})
+            else:
+                source = FileStorage.__refs.get(token[0], {}).get(
+                    token[1], {})
+            entry = FileStorage.__id_order.get(token)
+            if entry is None or entry[0] is not source:
+                entry = (source, sorted(source))
+                FileStorage.__id_order[token] = entry
+            found.append(_with_prefix(entry[1], prefix))
+        if len(found) == 1:
+            return found[0]
+        return heapq.merge(*found)
+
+    def __rank(self, store, key, obj):
+        '''
+            Brings __ranges of store up to date with the numeric
+            attributes of obj, an instance or a parsed dict
+        '''
+        if not key.startswith("Place."):
+            return
+        for attr, index in store.__ranges.items():
+            index.add(key, _rank_value(obj, attr))
+
+    def __build_place_indexes(self, store):
+        '''
+            Builds __ranges and __amenities of store from its places in
+            one sort per attribute and one pass per amenity, for reloads
+        '''
+        places = store.__classes.get("Place", {})
+        store.__ranges = {
+            attr: SortedIndex((key, _rank_value(obj, attr))
+                              for key, obj in places.items())
+            for attr in FileStorage.__ranges}
+        store.__amenities = BitmapIndex((key, _amenity_ids(obj))
+                                        for key, obj in places.items())
+
+    def __link(self, store, key, obj):
+        '''
+            Brings __amenities of store up to date with the amenity_ids
+            of obj, a place or its parsed dict
+        '''
+        if not key.startswith("Place.") or store.__amenities is None:
+            return
+        store.__amenities.add(key, _amenity_ids(obj))
+
+    def __put(self, store, key, obj):
+        '''
+            Stores obj under key in the __objects of store, FileStorage
+            or a store being reloaded, and in its class partition
+        '''
+        store.__objects[key] = obj
+        cls_name = key.split(".", 1)[0]
+        partition = store.__classes.setdefault(cls_name, {})
+        if key not in partition:
+            store.__id_order.pop(cls_name, None)
+        partition[key] = obj
+        self.__index(store, key, obj)
+        store.__search.add(key, obj)
+        store.__geo.add(key, obj)
+        self.__rank(store, key, obj)
+        self.__link(store, key, obj)
+
+    def __index(self, store, key, obj):
+        '''
+            Brings __refs up to date with the foreign keys of obj, an
+            instance or a parsed dict
+        '''
+        values = {}
+        for attr in FileStorage.__ref_attrs:
+            if type(obj) is dict:
+                value = obj.get(attr)
+            else:
+                value = getattr(obj, attr, None)
+            if value:
+                values[attr] = value
+        old = store.__ref_values.get(key)
+        if old == values:
+            return
+        if old:
+            self.__unindex(store, key, old)
+        if values:
+            store.__ref_values[key] = values
+            for attr, value in values.items():
+                store.__refs.setdefault(attr, {}).setdefault(
+                    value, {})[key] = None
+                store.__id_order.pop((attr, value), None)
+        else:
+            store.__ref_values.pop(key, None)
+
+    def __unindex(self, store, key, values):
+        '''
+            Removes key from __refs for the given foreign key values
+        '''
+        for attr, value in values.items():
+            refs = store.__refs.get(attr, {})
+            keys = refs.get(value)
+            store.__id_order.pop((attr, value), None)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del refs[value]
+
+    def __mark(self, key):
+        '''
+            Records that the object under key must be written again
+        '''
+        FileStorage.__dirty.add(key)
+        FileStorage.__deleted.discard(key)
+        FileStorage.__dirty_shards.add(self.__shard_of(key))
+        FileStorage.__serialized.pop(key, None)
+
+    def __serialize(self, key, val):
+        '''
+            Return the JSON text of val, an instance or a parsed dict,
+            reusing the text of the last write while it is unchanged
+        '''
+        text = FileStorage.__serialized.get(key)
+        if text is None:
+            if type(val) is not dict:
+                val = val.to_dict()
+            text = json.dumps(val)
+            FileStorage.__serialized[key] = text
+        return text
+
+    def __load(self, store, key, val):
+        '''
+            Stores the parsed dict val under key, as an instance unless
+            in lazy mode
+        '''
+        store.__serialized.pop(key, None)
+        if type(val) is not dict:
+            self.__put(store, key, val)
+        elif FileStorage.__lazy:
+            self.__put(store, key, val)
+            store.__lazy_classes.add(key.split(".", 1)[0])
+        else:
+            self.__put(store, key, models.classes[val["__class__"]](**val))
+
+    def __apply(self, store, records):
+        '''
+            Applies journal records to the __objects of store and
+            returns the shards they touch, which the next checkpoint
+            must rewrite before it removes the journal
+        '''
+        shards = set()
+        for rec in records:
+            if rec["op"] == "put":
+                self.__load(store, rec["key"], rec["value"])
+            else:
+                self.__drop(store, rec["key"])
+            shards.add(self.__shard_of(rec["key"]))
+        return shards
+
+    def __hydrate(self, key):
+        '''
+            Returns the instance stored under key, building it first if
+            only its parsed dict is loaded
+        '''
+        obj = FileStorage.__objects.get(key)
+        if type(obj) is dict:
+            with FileStorage.__hydrate_lock:
+                obj = FileStorage.__objects.get(key)
+                if type(obj) is dict:
+                    obj = models.classes[obj["__class__"]](**obj)
+                    self.__swap(key, obj)
+        return obj
+
+    def __hydrate_class(self, cls_name):
+        '''
+            Builds the instances still missing in a class partition
+        '''
+        with FileStorage.__hydrate_lock:
+            partition = FileStorage.__classes.get(cls_name, {})
+            for key, val in list(partition.items()):
+                if type(val) is dict:
+                    self.__swap(key, models.classes[val["__class__"]](**val))
+            FileStorage.__lazy_classes.discard(cls_name)
+
+    def __swap(self, key, obj):
+        '''
+            Replaces the parsed dict under key by obj, the instance built
+            from it, which the indexes already describe
+        '''
+        FileStorage.__objects[key] = obj
+        FileStorage.__classes[key.split(".", 1)[0]][key] = obj
+
+    def __drop(self, store, key):
+        '''
+            Removes key from the __objects of store and its class
+            partition
+        '''
+        store.__serialized.pop(key, None)
+        store.__objects.pop(key, None)
+        store.__search.remove(key)
+        store.__geo.remove(key)
+        if store.__amenities is not None:
+            store.__amenities.remove(key)
+        for index in store.__ranges.values():
+            index.remove(key)
+        values = store.__ref_values.pop(key, None)
+        if values:
+            self.__unindex(store, key, values)
+        cls_name = key.split(".", 1)[0]
+        store.__classes.get(cls_name, {}).pop(key, None)
+        store.__id_order.pop(cls_name, None)
+
+    def __write(self):
+        '''
+            Writes the pending changes to the journal, or a new snapshot
+            when not in journal mode.
+        '''
+        with FileStorage.__io_lock, self.__file_lock(True):
+            if FileStorage.__shared:
+                self.__catch_up()
+            with FileStorage.__rwlock.reading():
+                self.__append()
+
+    def __append(self):
+        '''
+            Does the work of __write(), with the locks held
+        '''
+        if not FileStorage.__journal:
+            self.__checkpoint()
+            return
+        records = []
+        for key in FileStorage.__dirty:
+            obj = FileStorage.__objects.get(key)
+            if obj is not None:
+                records.append('{{"op": "put", "key": {}, '
+                               '"value": {}}}\n'.format(
+                                   json.dumps(key),
+                                   self.__serialize(key, obj)))
+        for key in FileStorage.__deleted:
+            records.append(json.dumps({"op": "del", "key": key}) + "\n")
+        FileStorage.__dirty = set()
+        FileStorage.__deleted = set()
+        if not records:
+            return
+        data = "".join(records)
+        with open(self.__journal_path(), mode='ab') as fd:
+            if fd.tell() > FileStorage.__journal_offset:
+                # a record torn by a crash; replay stops at it, so
+                # anything appended after it would never be read
+                fd.truncate(FileStorage.__journal_offset)
+            fd.write(data.encode("UTF8"))
+            fd.flush()
+            os.fsync(fd.fileno())
+            FileStorage.__journal_offset = fd.tell()
+        if FileStorage.__journal_offset > FileStorage.__journal_limit:
+            self.__checkpoint()
+
+    def __reload(self, keep):
+        '''
+            Does the work of reload(). The new store is built aside and
+            swapped in whole; with keep, the changes not saved yet are
+            carried over to it.
+        '''
+        snapshot_stat = _file_stat(self.__snapshot_path())
+        if snapshot_stat is None and \
+                not os.path.exists(self.__journal_path()) and \
+                not (keep and FileStorage.__snapshot_stat):
+            FileStorage.__snapshot_stat = None
+            FileStorage.__journal_offset = 0
+            return
+        store = SimpleNamespace()
+        store.__objects = {}
+        store.__classes = {}
+        store.__lazy_classes = set()
+        store.__serialized = {}
+        store.__refs = {}
+        store.__ref_values = {}
+        store.__id_order = {}
+        store.__search = SearchIndex()
+        store.__geo = GeoIndex()
+        # built once everything is read; one insort or bitmap OR per
+        # place would make the reload quadratic
+        store.__ranges = {}
+        store.__amenities = None
+        self.__read_snapshot(store)
+        records, offset = self.__read_journal(0)
+        replayed = self.__apply(store, records)
+        self.__build_place_indexes(store)
+        with FileStorage.__rwlock.writing():
+            if keep:
+                for key in FileStorage.__dirty:
+                    obj = FileStorage.__objects.get(key)
+                    if obj is not None:
+                        self.__put(store, key, obj)
+                for key in FileStorage.__deleted:
+                    self.__drop(store, key)
+            for name, value in vars(store).items():
+                setattr(FileStorage, name, value)
+            if not keep:
+                FileStorage.__dirty = set()
+                FileStorage.__deleted = set()
+                FileStorage.__dirty_shards = set()
+            FileStorage.__dirty_shards |= replayed
+        FileStorage.__snapshot_stat = snapshot_stat
+        FileStorage.__journal_offset = offset
+
+    def __catch_up(self):
+        '''
+            Brings __objects up to date with the files, replaying only
+            the new journal records when the snapshot is unchanged.
+            The changes not saved yet are kept.
+        '''
+        snapshot_stat = _file_stat(self.__snapshot_path())
+        if snapshot_stat != FileStorage.__snapshot_stat:
+            self.__reload(True)
+            return
+        try:
+            size = os.path.getsize(self.__journal_path())
+        except FileNotFoundError:
+            size = 0
+        if size == FileStorage.__journal_offset:
+            return
+        if size < FileStorage.__journal_offset:
+            self.__reload(True)
+            return
+        records, offset = self.__read_journal(FileStorage.__journal_offset)
+        with FileStorage.__rwlock.writing():
+            pending = FileStorage.__dirty | FileStorage.__deleted
+            FileStorage.__dirty_shards |= self.__apply(
+                FileStorage, [rec for rec in records
+                              if rec["key"] not in pending])
+        FileStorage.__journal_offset = offset
+
+    @contextmanager
+    def __file_lock(self, exclusive):
+        '''
+            Holds the flock shared by the processes using the files, in
+            shared mode only
+        '''
+        if not FileStorage.__shared or fcntl is None:
+            yield
+            return
+        path = self.__snapshot_path().rstrip("/") + ".lock"
+        with open(path, mode='a') as fd:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def __checkpoint(self):
+        '''
+            Writes a new snapshot, only of the dirty shards if sharded
+        '''
+        if FileStorage.__shard_dir is None:
+            self.__compact()
+        else:
+            self.__compact(set(FileStorage.__dirty_shards))
+
+    def __compact(self, shards=None):
+        '''
+            Does the work of compact(), with __io_lock held and the
+            store locked for reading
+        '''
+        if FileStorage.__shard_dir is None:
+            items = ((key, self.__serialize(key, val))
+                     for key, val in FileStorage.__objects.items())
+            self.__replace_file(FileStorage.__file_path, items)
+        else:
+            self.__write_shards(shards)
+        FileStorage.__dirty = set()
+        FileStorage.__deleted = set()
+        FileStorage.__dirty_shards = set()
+        try:
+            os.remove(self.__journal_path())
+        except FileNotFoundError:
+            pass
+        FileStorage.__snapshot_stat = _file_stat(self.__snapshot_path())
+        FileStorage.__journal_offset = 0
+
+    def __shard_of(self, key):
+        '''
+            Return the (class name, partition) shard key belongs to
+        '''
+        cls_name, obj_id = key.split(".", 1)
+        if FileStorage.__shards <= 1:
+            return (cls_name, 0)
+        return (cls_name, zlib.crc32(obj_id.encode()) % FileStorage.__shards)
+
+    def __shard_path(self, shard):
+        '''
+            Return the path of the file that stores shard
+        '''
+        cls_name, part = shard
+        if FileStorage.__shards <= 1:
+            name = cls_name + ".json"
+        else:
+            name = "{}.{}.json".format(cls_name, part)
+        return os.path.join(FileStorage.__shard_dir, name)
+
+    def __write_shards(self, shards=None):
+        '''
+            Rewrites the given shards, or all of them, from __classes.
+            Shards left without objects are removed.
+        '''
+        os.makedirs(FileStorage.__shard_dir, exist_ok=True)
+        stale = []
+        if shards is None:
+            shards = set(self.__shard_of(key)
+                         for key in FileStorage.__objects)
+            current = set(self.__shard_path(shard) for shard in shards)
+            stale = [os.path.join(FileStorage.__shard_dir, name)
+                     for name in os.listdir(FileStorage.__shard_dir)
+                     if name.endswith(".json")]
+            stale = [path for path in stale if path not in current]
+        for path in stale:
+            os.remove(path)
+        for shard in shards:
+            partition = FileStorage.__classes.get(shard[0], {})
+            items = [(key, self.__serialize(key, val))
+                     for key, val in list(partition.items())
+                     if self.__shard_of(key) == shard]
+            path = self.__shard_path(shard)
+            if items:
+                self.__replace_file(path, items)
+            else:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def __read_snapshot(self, store):
+        '''
+            Loads the snapshot file, or every shard file, into store
+        '''
+        if FileStorage.__shard_dir is None:
+            try:
+                with open(FileStorage.__file_path, encoding="UTF8") as fd:
+                    for key, val in _iter_snapshot(fd, FileStorage.__format):
+                        self.__load(store, key, val)
+            except FileNotFoundError:
+                pass
+            return
+        try:
+            names = sorted(os.listdir(FileStorage.__shard_dir))
+        except FileNotFoundError:
+            return
+        paths = [os.path.join(FileStorage.__shard_dir, name)
+                 for name in names if name.endswith(".json")]
+        if FileStorage.__load_workers > 1 and len(paths) > 1:
+            with ThreadPoolExecutor(FileStorage.__load_workers) as pool:
+                for entries in pool.map(self.__read_shard, paths):
+                    for key, val in entries:
+                        self.__load(store, key, val)
+            return
+        for path in paths:
+            with open(path, encoding="UTF8") as fd:
+                for key, val in _iter_snapshot(fd, FileStorage.__format):
+                    self.__load(store, key, val)
+
+    def __read_shard(self, path):
+        '''
+            Return the entries of one shard file, built into instances
+            unless in lazy mode
+        '''
+        with open(path, encoding="UTF8") as fd:
+            entries = list(_iter_snapshot(fd, FileStorage.__format))
+        if FileStorage.__lazy:
+            return entries
+        return [(key, models.classes[val["__class__"]](**val))
+                for key, val in entries]
+
+    def __read_journal(self, offset):
+        '''
+            Reads the journal records that start at byte offset.
+            Returns the records and the offset just past the last
+            complete one; a torn final line is left for later.
+        '''
+        try:
+            with open(self.__journal_path(), mode='rb') as fd:
+                fd.seek(offset)
+                data = fd.read()
+        except FileNotFoundError:
+            return [], 0
+        records = []
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                break
+            offset += len(line)
+            records.append(rec)
+        return records, offset
+
+    def __replace_file(self, path, items):
+        '''
+            Atomically replaces the snapshot at path with the (key, dict)
+            pairs of items
+        '''
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode='w', encoding="UTF8") as tmp:
+                _dump_snapshot(tmp, items, FileStorage.__format)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def __snapshot_path(self):
+        '''
+            Return the snapshot file, or the shard directory if sharded
+        '''
+        if FileStorage.__shard_dir is None:
+            return FileStorage.__file_path
+        return FileStorage.__shard_dir
+
+    def __journal_path(self):
+        '''
+            Return the path of the journal that goes with the snapshot
+        '''
+        return self.__snapshot_path().rstrip("/") + ".log"
+
+
+atexit.register(FileStorage().flush)
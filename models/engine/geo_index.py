@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+'''
+    Define class GeoIndex
+'''
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def distance(lat1, lng1, lat2, lng2):
+    '''
+        Return the great circle distance in kilometers between two
+        points given in degrees.
+    '''
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + \
+        math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lng, radius):
+    '''
+        Return (south, west, north, east) of a box holding every point
+        within radius kilometers of lat, lng. west is greater than east
+        when the box crosses the antimeridian.
+    '''
+    dlat = math.degrees(radius / EARTH_RADIUS_KM)
+    south = max(-90.0, lat - dlat)
+    north = min(90.0, lat + dlat)
+    if south == -90.0 or north == 90.0:
+        return south, -180.0, north, 180.0
+    dlng = math.degrees(radius / (EARTH_RADIUS_KM * math.cos(
+        math.radians(max(abs(south), abs(north))))))
+    if dlng >= 180.0:
+        return south, -180.0, north, 180.0
+    west = (lng - dlng + 180.0) % 360.0 - 180.0
+    east = (lng + dlng + 180.0) % 360.0 - 180.0
+    return south, west, north, east
+
+
+def _coordinates(obj):
+    '''
+        Return the (latitude, longitude) set on obj, an instance or a
+        parsed dict, or None.
+    '''
+    values = obj if type(obj) is dict else obj.__dict__
+    lat = values.get("latitude")
+    lng = values.get("longitude")
+    if isinstance(lat, bool) or not isinstance(lat, (int, float)) or \
+            isinstance(lng, bool) or not isinstance(lng, (int, float)):
+        return None
+    return (float(lat), float(lng))
+
+
+class GeoIndex:
+    '''
+        Grid over the latitude and longitude of Place objects: every
+        cell of cell_size degrees holds the places inside it, so box
+        and radius queries only look at the cells they overlap.
+        Places without both coordinates set are left out.
+    '''
+    cell_size = 0.1
+
+    def __init__(self):
+        '''
+            Start with an empty grid
+        '''
+        self.__cells = {}
+        self.__points = {}
+
+    def add(self, key, obj):
+        '''
+            Indexes, or moves, obj under key
+            Arguments:
+                key : "Place.<id>" of obj; other classes are ignored.
+                obj : an instance or the parsed dict of one.
+        '''
+        if not key.startswith("Place."):
+            return
+        point = _coordinates(obj)
+        if self.__points.get(key) == point:
+            return
+        self.remove(key)
+        if point is not None:
+            self.__points[key] = point
+            self.__cells.setdefault(self.__cell(*point), {})[key] = point
+
+    def remove(self, key):
+        '''
+            Drops the place under key from the grid
+        '''
+        point = self.__points.pop(key, None)
+        if point is not None:
+            cell = self.__cell(*point)
+            del self.__cells[cell][key]
+            if not self.__cells[cell]:
+                del self.__cells[cell]
+
+    def within(self, south, west, north, east):
+        '''
+            Return the keys of the places inside a box, which crosses
+            the antimeridian when west is greater than east
+        '''
+        if west > east:
+            return self.within(south, west, north, 180.0) + \
+                self.within(south, -180.0, north, east)
+        rows = range(self.__row(south), self.__row(north) + 1)
+        cols = range(self.__row(west), self.__row(east) + 1)
+        if len(rows) * len(cols) > len(self.__cells):
+            cells = [points for (row, col), points in self.__cells.items()
+                     if row in rows and col in cols]
+        else:
+            cells = [self.__cells[(row, col)] for row in rows
+                     for col in cols if (row, col) in self.__cells]
+        return [key for points in cells
+                for key, (lat, lng) in points.items()
+                if south <= lat <= north and west <= lng <= east]
+
+    def near(self, lat, lng, radius, limit=None):
+        '''
+            Return (key, distance) of the places within radius
+            kilometers of lat, lng, nearest first
+        '''
+        found = []
+        for key in self.within(*bounding_box(lat, lng, radius)):
+            dist = distance(lat, lng, *self.__points[key])
+            if dist <= radius:
+                found.append((key, dist))
+        if limit is not None:
+            return heapq.nsmallest(limit, found, key=lambda kd: kd[1])
+        return sorted(found, key=lambda kd: kd[1])
+
+    def __row(self, degrees):
+        '''
+            Return the grid row or column holding degrees
+        '''
+        return math.floor(degrees / GeoIndex.cell_size)
+
+    def __cell(self, lat, lng):
+        '''
+            Return the grid cell holding a point
+        '''
+        return (self.__row(lat), self.__row(lng))
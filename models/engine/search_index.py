@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+'''
+    Define class SearchIndex
+'''
+import heapq
+import math
+import re
+import threading
+
+_WORD = re.compile(r"\w+")
+
+
+def _tokens(text):
+    '''
+        Return the lower cased words of text.
+    '''
+    return _WORD.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    '''
+        Inverted index over the text attributes of Place and Review,
+        ranking matches with BM25.
+
+        add() and remove() only queue the change so that storage can
+        call them on every attribute change; the queue is folded into
+        the postings by the next search().
+    '''
+    fields = {"Place": ("name", "description"), "Review": ("text",)}
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        '''
+            Start with an empty index
+        '''
+        self.__postings = {}
+        self.__lengths = {}
+        self.__terms = {}
+        self.__total = 0
+        self.__pending = {}
+        self.__lock = threading.Lock()
+
+    def add(self, key, obj):
+        '''
+            Indexes, or indexes again, obj under key
+            Arguments:
+                key : "<class name>.<id>" of obj.
+                obj : an instance or the parsed dict of one.
+        '''
+        if key.split(".", 1)[0] in SearchIndex.fields:
+            with self.__lock:
+                self.__pending[key] = obj
+
+    def remove(self, key):
+        '''
+            Drops the object under key from the index
+        '''
+        if key.split(".", 1)[0] in SearchIndex.fields:
+            with self.__lock:
+                self.__pending[key] = None
+
+    def search(self, query, classes=None, limit=10):
+        '''
+            Ranks the indexed objects against the words of query
+            Arguments:
+                query : text to search for.
+                classes : class names to search, all of them if None.
+                limit : most results to return.
+            Returns:
+                list of (key, score), best match first
+        '''
+        terms = set(_tokens(query))
+        prefixes = tuple(name + "." for name in classes) if classes else ""
+        with self.__lock:
+            self.__flush()
+            count = len(self.__lengths)
+            if not terms or not count:
+                return []
+            avg = self.__total / count
+            scores = {}
+            for term in terms:
+                postings = self.__postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                for key, tf in postings.items():
+                    if prefixes and not key.startswith(prefixes):
+                        continue
+                    norm = self.k1 * (1 - self.b +
+                                      self.b * self.__lengths[key] / avg)
+                    scores[key] = scores.get(key, 0.0) + \
+                        idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+
+    def __flush(self):
+        '''
+            Applies the queued changes to the postings
+        '''
+        pending, self.__pending = self.__pending, {}
+        for key, obj in pending.items():
+            self.__drop(key)
+            if obj is not None:
+                self.__put(key, obj)
+
+    def __put(self, key, obj):
+        '''
+            Adds the words of obj to the postings
+        '''
+        words = []
+        for attr in SearchIndex.fields[key.split(".", 1)[0]]:
+            if type(obj) is dict:
+                text = obj.get(attr)
+            else:
+                text = getattr(obj, attr, None)
+            if isinstance(text, str):
+                words.extend(_tokens(text))
+        counts = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        for word, tf in counts.items():
+            self.__postings.setdefault(word, {})[key] = tf
+        self.__terms[key] = tuple(counts)
+        self.__lengths[key] = len(words)
+        self.__total += len(words)
+
+    def __drop(self, key):
+        '''
+            Removes the words of the object under key from the postings
+        '''
+        for word in self.__terms.pop(key, ()):
+            postings = self.__postings[word]
+            del postings[key]
+            if not postings:
+                del self.__postings[word]
+        self.__total -= self.__lengths.pop(key, 0)
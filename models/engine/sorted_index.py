@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+'''
+    Define class SortedIndex
+'''
+from bisect import bisect_left, bisect_right, insort
+
+
+class _Top:
+    '''
+        Sorts after any key, to bound the entries of one value
+    '''
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_TOP = _Top()
+
+
+def _number(value):
+    '''
+        Return True if value is an int or a float, but not a bool.
+    '''
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class SortedIndex:
+    '''
+        Keys of objects ordered by the value of one numeric attribute,
+        so range conditions are answered by binary search. Objects
+        whose value is not a number are left out.
+    '''
+
+    def __init__(self, items=()):
+        '''
+            Start with the (key, value) pairs of items, sorted at once
+            rather than inserted one by one
+        '''
+        self.__values = {key: value for key, value in items
+                         if _number(value)}
+        self.__entries = sorted((value, key)
+                                for key, value in self.__values.items())
+
+    def __len__(self):
+        '''
+            Return the number of keys indexed
+        '''
+        return len(self.__entries)
+
+    def add(self, key, value):
+        '''
+            Indexes, or moves, key under value
+        '''
+        if key in self.__values and self.__values[key] == value:
+            return
+        self.remove(key)
+        if _number(value):
+            insort(self.__entries, (value, key))
+            self.__values[key] = value
+
+    def remove(self, key):
+        '''
+            Drops key from the index
+        '''
+        if key in self.__values:
+            value = self.__values.pop(key)
+            del self.__entries[bisect_left(self.__entries, (value, key))]
+
+    def range(self, gt=None, gte=None, lt=None, lte=None):
+        '''
+            Return the keys whose value is within the given bounds, in
+            the order of their values
+        '''
+        start = 0
+        stop = len(self.__entries)
+        if gte is not None:
+            start = max(start, bisect_left(self.__entries, (gte,)))
+        if gt is not None:
+            start = max(start, bisect_right(self.__entries, (gt, _TOP)))
+        if lte is not None:
+            stop = min(stop, bisect_right(self.__entries, (lte, _TOP)))
+        if lt is not None:
+            stop = min(stop, bisect_left(self.__entries, (lt,)))
+        return [key for value, key in self.__entries[start:stop]]
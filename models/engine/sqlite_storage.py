@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+'''
+    Define class SQLiteStorage
+'''
+from os import getenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from models.engine.db_storage import DBStorage
+
+_PRAGMAS = ("PRAGMA foreign_keys=ON",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA cache_size=-65536",
+            "PRAGMA mmap_size=268435456",
+            "PRAGMA busy_timeout=5000")
+
+
+def _set_pragmas(dbapi_connection, connection_record):
+    '''
+        Tune every new SQLite connection
+    '''
+    cursor = dbapi_connection.cursor()
+    for pragma in _PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _set_wal(dbapi_connection, connection_record):
+    '''
+        Let readers go on while a writer commits
+    '''
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def _engine(path):
+    '''
+        Return the engine of the SQLite database at path
+    '''
+    if path == ":memory:":
+        # one connection, or every session would see its own database
+        engine = create_engine(
+            "sqlite://", poolclass=StaticPool,
+            connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine("sqlite:///" + path, connect_args={
+            "check_same_thread": False})
+        event.listen(engine, "connect", _set_wal)
+    event.listen(engine, "connect", _set_pragmas)
+    return engine
+
+
+class SQLiteStorage(DBStorage):
+    '''
+        DBStorage on a SQLite file, HBNB_SQLITE_DB (hbnb.db by default),
+        or on one in-memory database shared by every thread when
+        HBNB_SQLITE_DB is ":memory:". The files listed in
+        HBNB_SQLITE_REPLICAS stand in for read replicas.
+    '''
+
+    def __init__(self, path=None, replicas=None):
+        '''
+            Create engine and link to the SQLite database
+            Arguments:
+                path : database file to use instead of HBNB_SQLITE_DB.
+                replicas : list of files to use instead of
+                           HBNB_SQLITE_REPLICAS.
+        '''
+        if path is None:
+            path = getenv("HBNB_SQLITE_DB", "hbnb.db")
+        if replicas is None:
+            replicas = [replica for replica in getenv(
+                "HBNB_SQLITE_REPLICAS", "").split(",") if replica]
+        super().__init__(_engine(path),
+                         [_engine(replica) for replica in replicas])
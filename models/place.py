@@ -6,7 +6,7 @@ from os import getenv
 from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table
 from sqlalchemy.orm import relationship
 from models.base_model import BaseModel, Base
-# from models.amenity import Amenity
+import models
 
 
 place_amenity = Table('place_amenity', Base.metadata,
@@ -14,7 +14,7 @@ place_amenity = Table('place_amenity', Base.metadata,
                              primary_key=True, nullable=False),
                       Column('amenity_id', String(60),
                              ForeignKey("amenities.id"),
-                             primary_key=True, nullable=False))
+                             primary_key=True, nullable=False, index=True))
 
 
 class Place(BaseModel, Base):
@@ -22,17 +22,22 @@ class Place(BaseModel, Base):
         Describe the Place class which is derived from BaseModel.
     '''
     __tablename__ = "places"
-    if getenv("HBNB_TYPE_STORAGE", "fs") == "db":
-        city_id = Column(String(60), ForeignKey("cities.id"), nullable=False)
-        user_id = Column(String(60), ForeignKey("users.id"), nullable=False)
-        name = Column(String(128), nullable=False)
+    if getenv("HBNB_TYPE_STORAGE", "fs") in ("db", "sqlite"):
+        city_id = Column(String(60), ForeignKey("cities.id"), nullable=False,
+                         index=True)
+        user_id = Column(String(60), ForeignKey("users.id"), nullable=False,
+                         index=True)
+        name = Column(String(128), nullable=False, index=True)
         description = Column(String(1024), nullable=True)
-        number_rooms = Column(Integer, default=0, nullable=False)
-        number_bathrooms = Column(Integer, default=0, nullable=False)
-        max_guest = Column(Integer, default=0, nullable=False)
-        price_by_night = Column(Integer, default=0, nullable=False)
-        latitude = Column(Float, nullable=True)
-        longitude = Column(Float, nullable=True)
+        number_rooms = Column(Integer, default=0, nullable=False,
+                              index=True)
+        number_bathrooms = Column(Integer, default=0, nullable=False,
+                                  index=True)
+        max_guest = Column(Integer, default=0, nullable=False, index=True)
+        price_by_night = Column(Integer, default=0, nullable=False,
+                                index=True)
+        latitude = Column(Float, nullable=True, index=True)
+        longitude = Column(Float, nullable=True, index=True)
         reviews = relationship("Review", backref="place",
                                cascade="all, delete, delete-orphan")
         amenities = relationship("Amenity", secondary=place_amenity,
@@ -57,11 +62,7 @@ class Place(BaseModel, Base):
                 Return list: Examine cases if Place-Review FileStorage
                 when Amenity.place_id=curr place.id
             '''
-            list_reviews = []
-            for review in models.storage.all(Review).values():
-                if review.place_id == self.id:
-                    list_reviews.append(review)
-            return list_reviews
+            return models.storage.lookup("Review", "place_id", self.id)
 
         @property
         def amenities(self):
@@ -69,19 +70,15 @@ class Place(BaseModel, Base):
                 Return list: Facilities on-site there is a many-to-many
                 FileStorage link between the Amenity and the Place.
             '''
-            list_amenities = []
-            for amenity in models.storage.all(Amenity).values():
-                if amenity.place_id == self.id:
-                    amenity_list.append(amenity)
-            return list_amenities
+            return models.storage.get_many("Amenity", self.amenity_ids)
 
         @amenities.setter
         def amenities(self, amenity=None):
             '''
-                Set list: Amenities if Amenity.place_id == current place.id
-                Set amending Amenity_ids attribute in place instance objs.
+                Set list: Link an Amenity to the current place by adding
+                its id to the amenity_ids attribute of the place.
             '''
-            if amenity:
-                for amenity in models.storage.all(Amenity).values():
-                    if amenity.place_id == self.id:
-                        amenity_ids.append(amenity)
+            if amenity is not None and \
+                    amenity.__class__.__name__ == "Amenity" and \
+                    amenity.id not in self.amenity_ids:
+                self.amenity_ids = self.amenity_ids + [amenity.id]
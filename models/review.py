@@ -13,10 +13,12 @@ class Review(BaseModel, Base):
         Application of the Review.
     '''
     __tablename__ = "reviews"
-    if getenv("HBNB_TYPE_STORAGE") == "db":
+    if getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"):
         text = Column(String(1024), nullable=False)
-        place_id = Column(String(60), ForeignKey("places.id"), nullable=False)
-        user_id = Column(String(60), ForeignKey("users.id"), nullable=False)
+        place_id = Column(String(60), ForeignKey("places.id"), nullable=False,
+                          index=True)
+        user_id = Column(String(60), ForeignKey("users.id"), nullable=False,
+                         index=True)
     else:
         place_id = ""
         user_id = ""
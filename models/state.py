@@ -16,8 +16,8 @@ class State(BaseModel, Base):
     '''
     __tablename__ = "states"
 
-    if getenv("HBNB_TYPE_STORAGE") == "db":
-        name = Column(String(128), nullable=False)
+    if getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"):
+        name = Column(String(128), nullable=False, index=True)
         cities = relationship("City", backref="state",
                               cascade="all, delete, delete-orphan")
     else:
@@ -30,8 +30,4 @@ class State(BaseModel, Base):
                 State.id
                 FileStorage relationsp between State and City
             '''
-            list_cities = []
-            for city in models.storage.all("City").values():
-                if city.state_id == self.id:
-                    list_cities.append(city)
-            return list_cities
+            return models.storage.lookup("City", "state_id", self.id)
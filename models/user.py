@@ -13,8 +13,8 @@ class User(BaseModel, Base):
         An explanation of the User class
     '''
     __tablename__ = "users"
-    if getenv("HBNB_TYPE_STORAGE", "fs") == "db":
-        email = Column(String(128), nullable=False)
+    if getenv("HBNB_TYPE_STORAGE", "fs") in ("db", "sqlite"):
+        email = Column(String(128), nullable=False, index=True)
         password = Column(String(128), nullable=False)
         first_name = Column(String(128), nullable=True)
         last_name = Column(String(128), nullable=True)
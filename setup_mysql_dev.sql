@@ -5,3 +5,106 @@ CREATE USER IF NOT EXISTS 'hbnb_dev'@'localhost' IDENTIFIED BY 'hbnb_dev_pwd';
 GRANT ALL PRIVILEGES ON `hbnb_dev_db`.* TO 'hbnb_dev'@'localhost';
 GRANT SELECT ON `performance_schema`.* TO 'hbnb_dev'@'localhost';
 FLUSH PRIVILEGES;
+
+-- tables with the indexes of the hot lookups, filters and sorts,
+-- so they exist before the first query
+USE hbnb_dev_db;
+
+CREATE TABLE IF NOT EXISTS amenities (
+    name VARCHAR(128) NOT NULL,
+    id VARCHAR(60) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    INDEX ix_amenities_name (name),
+    INDEX ix_amenities_updated_at (updated_at)
+);
+
+CREATE TABLE IF NOT EXISTS states (
+    name VARCHAR(128) NOT NULL,
+    id VARCHAR(60) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    INDEX ix_states_name (name),
+    INDEX ix_states_updated_at (updated_at)
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    email VARCHAR(128) NOT NULL,
+    password VARCHAR(128) NOT NULL,
+    first_name VARCHAR(128),
+    last_name VARCHAR(128),
+    id VARCHAR(60) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    INDEX ix_users_email (email),
+    INDEX ix_users_updated_at (updated_at)
+);
+
+CREATE TABLE IF NOT EXISTS cities (
+    name VARCHAR(128) NOT NULL,
+    state_id VARCHAR(60) NOT NULL,
+    id VARCHAR(60) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(state_id) REFERENCES states (id),
+    INDEX ix_cities_name (name),
+    INDEX ix_cities_state_id (state_id),
+    INDEX ix_cities_updated_at (updated_at)
+);
+
+CREATE TABLE IF NOT EXISTS places (
+    city_id VARCHAR(60) NOT NULL,
+    user_id VARCHAR(60) NOT NULL,
+    name VARCHAR(128) NOT NULL,
+    description VARCHAR(1024),
+    number_rooms INTEGER NOT NULL,
+    number_bathrooms INTEGER NOT NULL,
+    max_guest INTEGER NOT NULL,
+    price_by_night INTEGER NOT NULL,
+    latitude FLOAT,
+    longitude FLOAT,
+    id VARCHAR(60) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(city_id) REFERENCES cities (id),
+    FOREIGN KEY(user_id) REFERENCES users (id),
+    INDEX ix_places_city_id (city_id),
+    INDEX ix_places_latitude (latitude),
+    INDEX ix_places_longitude (longitude),
+    INDEX ix_places_max_guest (max_guest),
+    INDEX ix_places_name (name),
+    INDEX ix_places_number_bathrooms (number_bathrooms),
+    INDEX ix_places_number_rooms (number_rooms),
+    INDEX ix_places_price_by_night (price_by_night),
+    INDEX ix_places_updated_at (updated_at),
+    INDEX ix_places_user_id (user_id)
+);
+
+CREATE TABLE IF NOT EXISTS place_amenity (
+    place_id VARCHAR(60) NOT NULL,
+    amenity_id VARCHAR(60) NOT NULL,
+    PRIMARY KEY (place_id, amenity_id),
+    FOREIGN KEY(place_id) REFERENCES places (id),
+    FOREIGN KEY(amenity_id) REFERENCES amenities (id),
+    INDEX ix_place_amenity_amenity_id (amenity_id)
+);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    text VARCHAR(1024) NOT NULL,
+    place_id VARCHAR(60) NOT NULL,
+    user_id VARCHAR(60) NOT NULL,
+    id VARCHAR(60) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(place_id) REFERENCES places (id),
+    FOREIGN KEY(user_id) REFERENCES users (id),
+    INDEX ix_reviews_place_id (place_id),
+    INDEX ix_reviews_updated_at (updated_at),
+    INDEX ix_reviews_user_id (user_id)
+);
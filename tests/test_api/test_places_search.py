@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+'''
+    Examining POST /api/v1/places_search
+'''
+import unittest
+from os import getenv
+from api.v1.app import app
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+
+db = getenv("HBNB_TYPE_STORAGE", "fs")
+
+
+class testPlacesSearch(unittest.TestCase):
+    '''
+        Filtering, paging and input checks of places_search
+    '''
+
+    def setUp(self):
+        '''
+            Two states, three cities and five places, two of them with
+            the amenity
+        '''
+        self.client = app.test_client()
+        self.user = User(email="search@hbnb.com", password="pwd")
+        self.states = [State(name="Ohio"), State(name="Utah")]
+        self.cities = [City(name="Akron", state_id=self.states[0].id),
+                       City(name="Dayton", state_id=self.states[0].id),
+                       City(name="Provo", state_id=self.states[1].id)]
+        self.places = [Place(name="Place{}".format(i),
+                             city_id=self.cities[i % 3].id,
+                             user_id=self.user.id) for i in range(5)]
+        self.amenity = Amenity(name="Sauna")
+        for obj in [self.user, self.amenity] + self.states + \
+                self.cities + self.places:
+            storage.new(obj)
+        for place in self.places[:2]:
+            if db in ("db", "sqlite"):
+                place.amenities.append(self.amenity)
+            else:
+                place.amenities = self.amenity
+        storage.save()
+        # every request starts on a fresh session, as in production
+        storage.close()
+
+    def tearDown(self):
+        '''
+            Remove the objects made by setUp
+        '''
+        for obj in self.places + self.cities + self.states + \
+                [self.amenity, self.user]:
+            # the requests closed the session the objects were made in
+            obj = storage.get(obj.__class__, obj.id)
+            if obj is not None:
+                storage.delete(obj)
+        storage.save()
+
+    def search(self, body):
+        '''
+            Return the IDs of the places found for body
+        '''
+        response = self.client.post("/api/v1/places_search", json=body)
+        self.assertEqual(response.status_code, 200)
+        return [place["id"] for place in response.get_json()]
+
+    def ids(self, places):
+        '''
+            Return the set of the IDs of places
+        '''
+        return set(place.id for place in places)
+
+    def test_states_and_cities(self):
+        '''
+            Verify states take in all their cities, added to cities
+        '''
+        found = self.search({"states": [self.states[1].id]})
+        self.assertEqual(set(found), self.ids(self.places[2::3]))
+        found = self.search({"states": [self.states[1].id],
+                             "cities": [self.cities[0].id]})
+        self.assertEqual(set(found),
+                         self.ids(self.places[2::3] + self.places[0::3]))
+
+    def test_amenities(self):
+        '''
+            Verify only the places having every amenity are kept
+        '''
+        found = self.search({"amenities": [self.amenity.id]})
+        self.assertEqual(set(found), self.ids(self.places[:2]))
+        found = self.search({"amenities": [self.amenity.id, "missing"]})
+        self.assertEqual(found, [])
+
+    def test_pages(self):
+        '''
+            Verify pages are disjoint, stable and cover every place
+        '''
+        body = {"states": [self.states[0].id]}
+        every = self.search(body)
+        pages = []
+        for offset in range(0, len(every), 2):
+            page = self.search(dict(body, limit=2, offset=offset))
+            self.assertEqual(page, self.search(dict(body, limit=2,
+                                                    offset=offset)))
+            pages += page
+        self.assertEqual(sorted(pages), sorted(every))
+        self.assertEqual(len(set(pages)), len(pages))
+        self.assertEqual(set(every), self.ids(
+            place for place in self.places
+            if place.city_id != self.cities[2].id))
+
+    def test_bad_input(self):
+        '''
+            Verify malformed bodies are answered with 400
+        '''
+        for body in ("not json", {"cities": "x"}, {"cities": [["x"]]},
+                     {"amenities": [{"a": 1}]}, {"states": [None]},
+                     {"limit": -1}, {"offset": "1"}):
+            if isinstance(body, str):
+                response = self.client.post(
+                    "/api/v1/places_search", data=body,
+                    content_type="application/json")
+            else:
+                response = self.client.post("/api/v1/places_search",
+                                            json=body)
+            self.assertEqual(response.status_code, 400, body)
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+'''
+    Examining GET /api/v1/search, /places/near and /places/within
+'''
+import unittest
+from api.v1.app import app
+from models import storage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+class testSearch(unittest.TestCase):
+    '''
+        Limits and input checks of the search and geographic views
+    '''
+
+    def setUp(self):
+        '''
+            Three zebra places a few kilometers apart
+        '''
+        self.client = app.test_client()
+        self.user = User(email="zebra@hbnb.com", password="pwd")
+        self.state = State(name="Kenya")
+        self.city = City(name="Nanyuki", state_id=self.state.id)
+        self.places = [Place(name="Zebra lodge {}".format(i),
+                             city_id=self.city.id, user_id=self.user.id,
+                             latitude=0.01 * i, longitude=37.07)
+                       for i in range(3)]
+        for obj in [self.user, self.state, self.city] + self.places:
+            storage.new(obj)
+        storage.save()
+        storage.close()
+
+    def tearDown(self):
+        '''
+            Remove the objects made by setUp
+        '''
+        for obj in self.places + [self.city, self.state, self.user]:
+            # the requests closed the session the objects were made in
+            obj = storage.get(obj.__class__, obj.id)
+            if obj is not None:
+                storage.delete(obj)
+        storage.save()
+
+    def get(self, url, status=200):
+        '''
+            Return the IDs of the objects url answers with
+        '''
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status, url)
+        if status == 200:
+            return [obj["id"] for obj in response.get_json()]
+
+    def test_search_limit(self):
+        '''
+            Verify the limit of /search is applied and checked
+        '''
+        url = "/api/v1/search?q=zebra&class=Place"
+        self.assertEqual(len(self.get(url)), 3)
+        self.assertEqual(len(self.get(url + "&limit=2")), 2)
+        self.get(url + "&limit=-1", 400)
+        self.get(url + "&limit=abc", 400)
+
+    def test_near_input(self):
+        '''
+            Verify /places/near applies its limit and checks its input
+        '''
+        url = "/api/v1/places/near?lat=0&lng=37.07&radius=10"
+        found = self.get(url)
+        self.assertEqual(found, [place.id for place in self.places])
+        self.assertEqual(self.get(url + "&limit=1"), [self.places[0].id])
+        self.get(url + "&limit=abc", 400)
+        self.get(url + "&limit=-1", 400)
+        self.get("/api/v1/places/near?lat=0&lng=37.07&radius=-1", 400)
+
+    def test_within_input(self):
+        '''
+            Verify /places/within applies its limit and checks it
+        '''
+        url = "/api/v1/places/within?bbox=-1,37,1,38"
+        self.assertEqual(len(self.get(url + "&limit=2")), 2)
+        self.get(url + "&limit=abc", 400)
+        self.get(url + "&limit=-2", 400)
@@ -48,7 +48,7 @@ class test_console(unittest.TestCase):
         console.onecmd("all")
         self.assertTrue(isinstance(self.capt_out.getvalue(), str))
 
-    @unittest.skipIf(db == "db", "Testing database storage only")
+    @unittest.skipIf(db in ("db", "sqlite"), "Testing database storage only")
     def test_show(self):
         '''
             Testing that demonstrates
@@ -65,7 +65,7 @@ class test_console(unittest.TestCase):
         sys.stdout = self.backup
         self.assertTrue(str is type(x))
 
-    @unittest.skipIf(db == "db", "Testing database storage only")
+    @unittest.skipIf(db in ("db", "sqlite"), "Testing database storage only")
     def test_show_class_name(self):
         '''
             Examining the error messages for missing class names.
@@ -98,7 +98,7 @@ class test_console(unittest.TestCase):
         sys.stdout = self.backup
         self.assertEqual("** instance id missing **\n", x)
 
-    @unittest.skipIf(db == "db", "Testing database storage only")
+    @unittest.skipIf(db in ("db", "sqlite"), "Testing database storage only")
     def test_show_no_instance_found(self):
         '''
             Test display message error due to lack ID
@@ -141,7 +141,39 @@ class test_console(unittest.TestCase):
         x = (self.capt_out.getvalue())
         self.assertEqual("** class doesn't exist **\n", x)
 
-    @unittest.skipIf(db != 'db', "Testing DBstorage only")
+    def test_count(self):
+        '''
+            Verify count prints the number of instances of a class
+        '''
+        console = self.create()
+        console.onecmd("count State")
+        before = int(self.capt_out.getvalue())
+        console.onecmd("create State name=\"Nevada\"")
+        self.capt_out.truncate(0)
+        self.capt_out.seek(0)
+        console.onecmd("count State")
+        self.assertEqual(int(self.capt_out.getvalue()), before + 1)
+
+    @unittest.skipIf(db not in ("db", "sqlite"), "Testing DBstorage only")
+    def test_count_base_model_db(self):
+        '''
+            Verify BaseModel, which has no table, counts as 0
+        '''
+        console = self.create()
+        console.onecmd("count BaseModel")
+        self.assertEqual(self.capt_out.getvalue(), "0\n")
+
+    @unittest.skipIf(db in ("db", "sqlite"), "Testing file storage only")
+    def test_explain_file_storage(self):
+        '''
+            Verify explain asks for a database storage
+        '''
+        console = self.create()
+        console.onecmd("explain")
+        x = (self.capt_out.getvalue())
+        self.assertEqual("** explain needs a database storage **\n", x)
+
+    @unittest.skipIf(db not in ('db', 'sqlite'), "Testing DBstorage only")
     def test_create_db(self):
         console = self.create()
         console.onecmd("create State name=California")
@@ -63,7 +63,8 @@ class TestAmenity(unittest.TestCase):
         '''
         self.assertTrue("name" in self.new_amenity.__dir__())
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_Amenity_attribute_type(self):
         '''
             Verify type of the name attribute for Amenity class.
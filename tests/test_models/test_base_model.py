@@ -9,6 +9,8 @@ import sys
 import datetime
 from models.base_model import BaseModel
 from io import StringIO
+from unittest import mock
+import models
 from os import getenv
 
 storage = getenv("HBNB_TYPE_STORAGE", "fs")
@@ -149,7 +151,8 @@ class TestBase(unittest.TestCase):
         new_model = BaseModel(my_model_dict)
         self.assertNotEqual(self.my_model, new_model)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_save(self):
         '''
             Verifies that the dates in the updated_at
@@ -159,6 +162,32 @@ class TestBase(unittest.TestCase):
         self.new.save()
         self.assertNotEqual(self.new.updated_at, old_update)
 
+    def test_init_does_not_touch(self):
+        '''
+            Verifies building an instance does not tell the storage
+        '''
+        with mock.patch.object(models.storage, "touch") as touch:
+            BaseModel()
+            BaseModel(**self.new.to_dict())
+        touch.assert_not_called()
+
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
+    def test_update_touches_once(self):
+        '''
+            Verifies update() sets every attribute and hands the object
+            to the storage once
+        '''
+        with mock.patch.object(models.storage, "touch") as touch, \
+                mock.patch.object(models.storage, "new") as new, \
+                mock.patch.object(models.storage, "save"):
+            self.new.update({"name": "Loft", "number_rooms": 3})
+            self.new.name = "Cabin"
+        self.assertEqual(self.new.number_rooms, 3)
+        new.assert_called_once_with(self.new)
+        touch.assert_called_once_with(self.new)
+        self.assertNotIn("_BaseModel__quiet_depth", self.new.to_dict())
+
     @unittest.skipIf(storage != "db", "Testing if using DBStorage")
     def test_basemodel_hasattr(self):
         '''
@@ -57,7 +57,8 @@ class TestUser(unittest.TestCase):
         self.assertTrue("state_id" in self.new_city.__dir__())
         self.assertTrue("name" in self.new_city.__dir__())
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_name(self):
         '''
             Verify the name type
@@ -65,7 +66,8 @@ class TestUser(unittest.TestCase):
         name = getattr(self.new_city, "name")
         self.assertIsInstance(name, str)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_name(self):
         '''
             Check the name kind
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+'''
+    Examining the module for the bitmap index.
+'''
+
+import unittest
+from models.engine.bitmap_index import BitmapIndex
+
+
+class testBitmapIndex(unittest.TestCase):
+    '''
+        Examining the BitmapIndex category
+    '''
+
+    def setUp(self):
+        '''
+            launching the index
+        '''
+        self.index = BitmapIndex()
+        self.index.add("Place.0", ["wifi"])
+        self.index.add("Place.1", ["wifi", "pool"])
+        self.index.add("Place.2", ["wifi", "pool", "gym"])
+        self.index.add("Place.3", [])
+
+    def test_all_of(self):
+        '''
+            Verify only the keys having every value are returned
+        '''
+        self.assertEqual(list(self.index.all_of(["wifi", "pool"])),
+                         ["Place.1", "Place.2"])
+        self.assertEqual(list(self.index.all_of(["gym", "sauna"])), [])
+        self.assertEqual(len(list(self.index.all_of([]))), 4)
+
+    def test_any_of(self):
+        '''
+            Verify the keys having one of the values are returned
+        '''
+        self.assertEqual(list(self.index.any_of(["gym", "pool"])),
+                         ["Place.1", "Place.2"])
+
+    def test_update_and_reuse(self):
+        '''
+            Verify changed values and reused ordinals
+        '''
+        self.index.add("Place.1", ["gym"])
+        self.assertEqual(list(self.index.all_of(["gym"])),
+                         ["Place.1", "Place.2"])
+        self.assertEqual(list(self.index.all_of(["pool"])), ["Place.2"])
+        self.index.remove("Place.0")
+        self.index.add("Place.4", ["wifi"])
+        self.assertEqual(list(self.index.all_of(["wifi"])),
+                         ["Place.4", "Place.2"])
+
+    def test_build_from_items(self):
+        '''
+            Verify an index built from pairs matches one added to
+        '''
+        items = [("Place.{}".format(i), ["wifi"] if i % 3 else ["pool"])
+                 for i in range(20)] + [("Place.none", None)]
+        index = BitmapIndex(items)
+        self.assertEqual(list(index.all_of(["pool"])),
+                         ["Place.{}".format(i) for i in range(0, 20, 3)])
+        self.assertEqual(len(list(index.all_of([]))), 21)
+        index.remove("Place.0")
+        index.add("Place.new", ["pool", "wifi"])
+        self.assertEqual(list(index.all_of(["pool", "wifi"])),
+                         ["Place.new"])
@@ -9,6 +9,10 @@ from models.engine.db_storage import DBStorage
 from models import storage
 from models.user import User
 from models.state import State
+from models.city import City
+from models.place import Place
+from models.amenity import Amenity
+from models.review import Review
 from models import storage
 from console import HBNBCommand
 from os import getenv
@@ -146,3 +150,197 @@ class test_DBStorage(unittest.TestCase):
         new_state3 = State(name="California")
         storage.new(new_state3)
         self.assertEqual(old_count + 3, storage.count("State"))
+
+
+@unittest.skipIf(db not in ("db", "sqlite"), "Testing DBstorage only")
+class test_DBStorageQueries(unittest.TestCase):
+    '''
+        DBStorage queries run on an in-memory SQLite database
+    '''
+
+    def setUp(self):
+        '''
+            Fill a fresh database with two states, their cities and
+            five places
+        '''
+        from models.engine.sqlite_storage import SQLiteStorage
+        self.storage = SQLiteStorage(":memory:")
+        self.storage.reload()
+        self.states = [State(name="Utah"), State(name="Ohio")]
+        self.cities = [City(name="Provo", state_id=self.states[0].id),
+                       City(name="Ogden", state_id=self.states[0].id),
+                       City(name="Akron", state_id=self.states[1].id)]
+        self.user = User(email="host@hbnb.io", password="pwd")
+        coords = [(40.23, -111.66), (41.22, -111.97), (41.08, -81.52),
+                  (40.25, -111.65), (0.0, 179.5)]
+        self.places = [Place(name="Place {}".format(i),
+                             city_id=self.cities[i % 3].id,
+                             user_id=self.user.id, price_by_night=i * 50,
+                             max_guest=i, latitude=lat, longitude=lng)
+                       for i, (lat, lng) in enumerate(coords)]
+        self.wifi = Amenity(name="Wifi")
+        self.pool = Amenity(name="Pool")
+        self.storage.new_many(self.states + self.cities + [self.user] +
+                              [self.wifi, self.pool] + self.places)
+        for place in self.places[:3]:
+            place.amenities.append(self.wifi)
+        self.places[1].amenities.append(self.pool)
+        self.storage.new(Review(text="quiet cabin with a view",
+                                place_id=self.places[0].id,
+                                user_id=self.user.id))
+        self.storage.save()
+        self.storage.close()
+
+    def tearDown(self):
+        '''
+            Give the connection back
+        '''
+        self.storage.close()
+
+    def ids(self, objs):
+        '''
+            Return the ids of objs
+        '''
+        return [obj.id for obj in objs]
+
+    def test_query_where(self):
+        '''
+            Verify query() filters on values and lists of values
+        '''
+        found = self.storage.query(City, where={
+            "state_id": self.states[0].id}, order_by="name")
+        self.assertEqual([c.name for c in found], ["Ogden", "Provo"])
+        found = self.storage.query("Place", where={"city_id": [
+            self.cities[0].id, self.cities[2].id]}, order_by="name")
+        self.assertEqual(self.ids(found), self.ids(
+            [self.places[0], self.places[2], self.places[3]]))
+        self.assertEqual(self.storage.query(City, where={"nope": 1}), [])
+
+    def test_query_ranges(self):
+        '''
+            Verify query() answers numeric ranges
+        '''
+        found = self.storage.query(Place, where={
+            "price_by_night": {"gte": 50, "lt": 150}},
+            order_by="price_by_night")
+        self.assertEqual(self.ids(found), self.ids(self.places[1:3]))
+        found = self.storage.query(Place, where={
+            "max_guest": {"gt": 1, "lte": 3}, "city_id": self.cities[0].id})
+        self.assertEqual(self.ids(found), [self.places[3].id])
+        with self.assertRaises(ValueError):
+            self.storage.query(Place, where={"max_guest": {"over": 1}})
+
+    def test_query_order_and_pages(self):
+        '''
+            Verify query() sorts, and pages in id order without a sort
+        '''
+        found = self.storage.query(Place, order_by="-price_by_night",
+                                   limit=2, offset=1)
+        self.assertEqual(self.ids(found), self.ids(self.places[3:1:-1]))
+        pages = [self.storage.query(Place, limit=2, offset=offset)
+                 for offset in (0, 2, 4)]
+        self.assertEqual([obj.id for page in pages for obj in page],
+                         sorted(self.ids(self.places)))
+
+    def test_query_amenities(self):
+        '''
+            Verify query() finds the places having all given amenities
+        '''
+        found = self.storage.query(Place, where={
+            "amenity_ids": self.wifi.id}, order_by="name")
+        self.assertEqual(self.ids(found), self.ids(self.places[:3]))
+        found = self.storage.query(Place, where={
+            "amenity_ids": [self.wifi.id, self.pool.id]})
+        self.assertEqual(self.ids(found), [self.places[1].id])
+        self.assertEqual(self.storage.query(Place, where={
+            "amenity_ids": [self.pool.id, "missing"]}), [])
+        self.assertEqual(len(self.storage.query(Place, where={
+            "amenity_ids": []})), 5)
+
+    def test_iter_all(self):
+        '''
+            Verify iter_all() pages through a table and lets the caller
+            run other queries between rows
+        '''
+        seen = []
+        for key, place in self.storage.iter_all(Place, batch_size=2):
+            self.assertIs(self.storage.get(Place, place.id), place)
+            self.assertEqual(place.cities.name,
+                             self.storage.get(City, place.city_id).name)
+            seen.append(key)
+        self.assertEqual(seen, sorted("Place." + place.id
+                                      for place in self.places))
+        found = dict(self.storage.iter_all([State, "City"], batch_size=3))
+        self.assertEqual(len(found), 5)
+
+    def test_get_many(self):
+        '''
+            Verify get_many() keeps the order of the ids and skips the
+            missing ones
+        '''
+        ids = [self.places[3].id, "missing", self.places[0].id]
+        self.assertEqual(self.ids(self.storage.get_many(Place, ids)),
+                         [self.places[3].id, self.places[0].id])
+        self.assertEqual(self.storage.get_many(Place, []), [])
+
+    def test_load(self):
+        '''
+            Verify the load option loads relationships the objects keep
+            once the session is closed
+        '''
+        states = self.storage.query(State, order_by="name",
+                                    load={"cities.places": "selectin"})
+        state = self.storage.get(State, self.states[1].id,
+                                 load={"cities": "joined"})
+        self.storage.close()
+        self.assertEqual(sorted(c.name for c in states[1].cities),
+                         ["Ogden", "Provo"])
+        self.assertEqual(sum(len(c.places) for c in states[1].cities), 4)
+        self.assertEqual([c.name for c in state.cities], ["Akron"])
+        with self.assertRaises(ValueError):
+            self.storage.query(State, load={"cities": "eager"})
+        with self.assertRaises(ValueError):
+            self.storage.query(State, load="name")
+
+    def test_near_and_within(self):
+        '''
+            Verify the geographic queries, across the antimeridian too
+        '''
+        found = self.storage.near(40.23, -111.66, 10)
+        self.assertEqual(self.ids(found), self.ids(self.places[0:4:3]))
+        self.assertEqual(self.ids(self.storage.near(40.23, -111.66, 10, 1)),
+                         [self.places[0].id])
+        found = self.storage.within(40, -112, 42, -111)
+        self.assertEqual(sorted(self.ids(found)), sorted(self.ids(
+            [self.places[0], self.places[1], self.places[3]])))
+        found = self.storage.within(-1, 179, 1, -179)
+        self.assertEqual(self.ids(found), [self.places[4].id])
+
+    def test_search(self):
+        '''
+            Verify search() ranks the places and reviews by their text
+        '''
+        found = self.storage.search("cabin")
+        self.assertEqual([obj.__class__.__name__ for obj in found],
+                         ["Review"])
+        found = self.storage.search("place 2", cls="Place", limit=1)
+        self.assertEqual(self.ids(found), [self.places[2].id])
+
+    def test_new_many_and_update_many(self):
+        '''
+            Verify objects added in bulk are stored and updated in bulk
+        '''
+        states = [State(name="State {}".format(i)) for i in range(25)]
+        self.storage.new_many(states)
+        self.storage.close()
+        self.assertEqual(self.storage.count(State), 27)
+        self.storage.update_many(State, {
+            states[0].id: {"name": "Idaho"}, states[1].id: {"name": "Iowa"},
+            "missing": {"name": "Nowhere"}})
+        self.storage.update_many(Place, {
+            self.places[0].id: {"price_by_night": 999}})
+        self.storage.close()
+        self.assertEqual(self.storage.get(State, states[1].id).name, "Iowa")
+        found = self.storage.query(Place, where={
+            "price_by_night": {"gte": 999}})
+        self.assertEqual(self.ids(found), [self.places[0].id])
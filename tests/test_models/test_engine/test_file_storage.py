@@ -3,20 +3,32 @@
     Examining the module for file storage.
 '''
 
+import io
 import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
 import time
 import json
 import unittest
+from unittest import mock
 import models
 from models import storage
 from models.base_model import BaseModel
 from models.state import State
-from models.engine.file_storage import FileStorage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.amenity import Amenity
+from models.engine.file_storage import FileStorage, _iter_json_object
+from models.engine.file_storage import _RWLock, _matches
 
 db = os.getenv("HBNB_TYPE_STORAGE")
 
 
-@unittest.skipIf(db == 'db', "Testing DBstorage only")
+@unittest.skipIf(db in ('db', 'sqlite'), "Testing DBstorage only")
 class testFileStorage(unittest.TestCase):
     '''
         Examining the FileStorage category
@@ -34,10 +46,11 @@ class testFileStorage(unittest.TestCase):
             Tiding up.
         '''
 
-        try:
-            os.remove("file.json")
-        except FileNotFoundError:
-            pass
+        for path in ("file.json", "file.json.log"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
 
     def test_all_return_type(self):
         '''
@@ -123,6 +136,252 @@ class testFileStorage(unittest.TestCase):
         for k, v in state_dict.items():
             self.assertFalse(state_id == k.split('.')[1])
 
+    def test_close_without_changes(self):
+        '''
+            Verify close() keeps the loaded objects if the file is as saved
+        '''
+        new_state = State(name="Florida")
+        self.storage.new(new_state)
+        self.storage.save()
+        self.storage.close()
+        self.assertIs(self.storage.get("State", new_state.id), new_state)
+
+    def test_close_picks_up_new_file(self):
+        '''
+            Verify close() reloads when file.json was replaced
+        '''
+        new_state = State(name="Arizona")
+        self.storage.new(new_state)
+        self.storage.save()
+        with open("file.json", encoding="UTF8") as fd:
+            content = json.load(fd)
+        content["State." + new_state.id]["name"] = "New Mexico"
+        with open("file.json", "w", encoding="UTF8") as fd:
+            json.dump(content, fd)
+        self.storage.close()
+        self.assertEqual(self.storage.get("State", new_state.id).name,
+                         "New Mexico")
+
+    def test_setattr_marks_dirty(self):
+        '''
+            Verify changing an attribute of a stored object marks it
+        '''
+        new_state = State(name="Kentucky")
+        self.storage.new(new_state)
+        self.storage.save()
+        key = "State." + new_state.id
+        self.assertNotIn(key, self.storage._FileStorage__dirty)
+        new_state.name = "Tennessee"
+        self.assertIn(key, self.storage._FileStorage__dirty)
+
+    def test_save_serializes_changed_objects_only(self):
+        '''
+            Verify unchanged objects are written from the cached text
+        '''
+        new_state = State(name="Wyoming")
+        self.storage.new(new_state)
+        self.storage.save()
+        with mock.patch.object(State, "to_dict",
+                               side_effect=AssertionError) as to_dict:
+            self.storage.save()
+            self.assertFalse(to_dict.called)
+            new_state.name = "Colorado"
+            with self.assertRaises(AssertionError):
+                self.storage.save()
+        self.storage.save()
+        with open("file.json", encoding="UTF8") as fd:
+            content = json.load(fd)
+        self.assertEqual(content["State." + new_state.id]["name"],
+                         "Colorado")
+
+    def test_lookup_follows_changes(self):
+        '''
+            Verify lookup() tracks new, edited and deleted objects
+        '''
+        city = City(name="Reno", state_id="state-1")
+        self.storage.new(city)
+        self.assertEqual(self.storage.lookup(City, "state_id", "state-1"),
+                         [city])
+        city.state_id = "state-2"
+        self.assertEqual(self.storage.lookup("City", "state_id", "state-1"),
+                         [])
+        self.assertEqual(self.storage.lookup("City", "state_id", "state-2"),
+                         [city])
+        self.storage.delete(city)
+        self.assertEqual(self.storage.lookup("City", "state_id", "state-2"),
+                         [])
+
+    def test_lookup_after_reload(self):
+        '''
+            Verify the reverse index is rebuilt by reload()
+        '''
+        city = City(name="Boise", state_id="state-3")
+        self.storage.new(city)
+        self.storage.save()
+        self.storage.reload()
+        found = self.storage.lookup("City", "state_id", "state-3")
+        self.assertEqual([c.id for c in found], [city.id])
+
+    def test_query_where_order_limit(self):
+        '''
+            Verify query() filters, sorts and pages the objects
+        '''
+        names = ["Provo", "Ogden", "Logan", "Moab"]
+        for name in names:
+            self.storage.new(City(name=name, state_id="state-4"))
+        self.storage.new(City(name="Ely", state_id="state-5"))
+        found = self.storage.query("City", where={"state_id": "state-4"},
+                                   order_by="name")
+        self.assertEqual([c.name for c in found], sorted(names))
+        found = self.storage.query(City, where={"state_id": "state-4"},
+                                   order_by="-name", limit=2, offset=1)
+        self.assertEqual([c.name for c in found], ["Ogden", "Moab"])
+        found = self.storage.query("City", where={
+            "state_id": ["state-4", "state-5"], "name": ["Ely", "Moab"]},
+            order_by="name")
+        self.assertEqual([c.name for c in found], ["Ely", "Moab"])
+        self.assertEqual(self.storage.query("City", where={
+            "state_id": "state-4", "name": "Ely"}), [])
+
+    def test_query_pages_by_id(self):
+        '''
+            Verify query() pages in id order when no order is given
+        '''
+        cities = [City(name="c{}".format(i), state_id="page-{}".format(i))
+                  for i in range(6)]
+        for city in cities:
+            self.storage.new(city)
+        where = {"state_id": {"page-{}".format(i) for i in range(6)}}
+        pages = [self.storage.query("City", where=where, limit=2,
+                                    offset=offset) for offset in (0, 2, 4)]
+        found = [c.id for page in pages for c in page]
+        self.assertEqual(found, sorted(c.id for c in cities))
+        self.storage.delete(cities.pop(0))
+        cities.append(City(name="c6", state_id="page-0"))
+        self.storage.new(cities[-1])
+        for query_where in (where, {"state_id": "page-0"}, {}):
+            found = self.storage.query("City", where=query_where, limit=50)
+            self.assertEqual([c.id for c in found],
+                             sorted(c.id for c in self.storage.all(
+                                 City).values() if _matches(c, query_where)))
+        found = self.storage.query("City", where=where, limit=2, offset=4)
+        self.assertEqual([c.id for c in found],
+                         sorted(c.id for c in cities)[4:6])
+
+    def test_query_ranges(self):
+        '''
+            Verify query() answers numeric ranges and follows updates
+        '''
+        places = [Place(city_id="city-9", price_by_night=price, max_guest=2)
+                  for price in (40, 80, 120, 160)]
+        for place in places:
+            self.storage.new(place)
+        where = {"city_id": "city-9",
+                 "price_by_night": {"gte": 80, "lt": 160}}
+        found = self.storage.query("Place", where=where,
+                                   order_by="price_by_night")
+        self.assertEqual(found, places[1:3])
+        places[0].price_by_night = 100
+        found = self.storage.query("Place", where=where,
+                                   order_by="price_by_night")
+        self.assertEqual(found, [places[1], places[0], places[2]])
+        where["max_guest"] = {"gt": 2}
+        self.assertEqual(self.storage.query("Place", where=where), [])
+        with self.assertRaises(ValueError):
+            self.storage.query("Place", where={"max_guest": {"over": 1}})
+
+    def test_query_ranges_after_reload(self):
+        '''
+            Verify reload() rebuilds the ranges of the places only
+        '''
+        places = [Place(city_id="city-8", price_by_night=price)
+                  for price in (30, 10, 20)]
+        for place in places:
+            self.storage.new(place)
+        self.storage.new(City(name="Ely", state_id="state-8"))
+        self.storage.save()
+        self.storage.reload()
+        found = self.storage.query("Place", where={
+            "city_id": "city-8", "price_by_night": {"lte": 20}},
+            order_by="price_by_night")
+        self.assertEqual([p.id for p in found],
+                         [places[1].id, places[2].id])
+
+    def test_query_amenities(self):
+        '''
+            Verify query() finds the places having all given amenities
+        '''
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        both = Place(name="both")
+        one = Place(name="one")
+        self.storage.new(both)
+        self.storage.new(one)
+        both.amenities = wifi
+        both.amenities = pool
+        one.amenities = wifi
+        where = {"amenity_ids": [wifi.id, pool.id]}
+        self.assertEqual(self.storage.query("Place", where=where), [both])
+        self.assertEqual(self.storage.query("Place", where={
+            "amenity_ids": wifi.id}, order_by="name"), [both, one])
+        one.amenities = pool
+        self.assertEqual(self.storage.query("Place", where=where,
+                                            order_by="name"), [both, one])
+        self.storage.delete(both)
+        self.assertEqual(self.storage.query("Place", where=where), [one])
+        everything = self.storage.query("Place", order_by="name")
+        self.assertEqual(self.storage.query("Place", where={
+            "amenity_ids": []}, order_by="name"), everything)
+        self.assertEqual(len(self.storage.query("Place", where={
+            "amenity_ids": []}, limit=1)), 1)
+
+    def test_query_amenities_after_reload(self):
+        '''
+            Verify reload() rebuilds the amenities of the places
+        '''
+        wifi = Amenity(name="Wifi")
+        places = [Place(name=str(i)) for i in range(4)]
+        for place in places:
+            self.storage.new(place)
+        for place in places[1:3]:
+            place.amenities = wifi
+        self.storage.save()
+        self.storage.reload()
+        found = self.storage.query("Place", where={"amenity_ids": wifi.id},
+                                   order_by="name")
+        self.assertEqual([p.id for p in found],
+                         [place.id for place in places[1:3]])
+
+    def test_search_follows_changes(self):
+        '''
+            Verify search() ranks new and edited text and drops deleted
+            objects
+        '''
+        place = Place(name="Treehouse", description="zebrawood treehouse")
+        review = Review(text="the zebrawood deck was lovely")
+        self.storage.new(place)
+        self.storage.new(review)
+        self.assertEqual(self.storage.search("zebrawood treehouse"),
+                         [place, review])
+        self.assertEqual(self.storage.search("zebrawood", "Review"), [review])
+        review.text = "lovely deck"
+        self.assertEqual(self.storage.search("zebrawood"), [place])
+        self.storage.delete(place)
+        self.assertEqual(self.storage.search("zebrawood"), [])
+
+    def test_near_follows_changes(self):
+        '''
+            Verify near() and within() track places as they move
+        '''
+        place = Place(name="Igloo", latitude=-75.1, longitude=123.3)
+        self.storage.new(place)
+        self.assertEqual(self.storage.near(-75.1, 123.4, 10), [place])
+        self.assertEqual(self.storage.within(-76, 123, -75, 124), [place])
+        place.latitude = -70.0
+        self.assertEqual(self.storage.near(-75.1, 123.4, 10), [])
+        self.storage.delete(place)
+        self.assertEqual(self.storage.near(-70.0, 123.3, 10), [])
+
     def test_model_storage(self):
         '''
             Filestorage Test State Model
@@ -152,3 +411,746 @@ class testFileStorage(unittest.TestCase):
         new_state3 = State(name="California")
         storage.new(new_state3)
         self.assertEqual(old_count + 3, storage.count("State"))
+
+    def test_all_accepts_class(self):
+        '''
+            Verify all() filters the same with a class or a class name
+        '''
+        new_state = State(name="Oregon")
+        storage.new(new_state)
+        key = "State.{}".format(new_state.id)
+        self.assertIn(key, storage.all(State))
+        self.assertEqual(storage.all(State), storage.all("State"))
+        self.assertNotIn(key, storage.all(BaseModel))
+
+    def test_iter_all(self):
+        '''
+            Verify iter_all yields the pairs of all(), for one class or
+            a list of them
+        '''
+        new_state = State(name="Nevada")
+        storage.new(new_state)
+        new_city = City(name="Reno", state_id=new_state.id)
+        storage.new(new_city)
+        self.assertEqual(dict(storage.iter_all()), storage.all())
+        self.assertEqual(dict(storage.iter_all("State")),
+                         storage.all(State))
+        both = storage.all([State, "City"])
+        self.assertIn("State." + new_state.id, both)
+        self.assertIn("City." + new_city.id, both)
+        self.assertEqual(len(both),
+                         storage.count(State) + storage.count(City))
+
+    def test_count_accepts_class(self):
+        '''
+            Verify count() gives the same number for a class or its name
+        '''
+        storage.new(State(name="Texas"))
+        self.assertEqual(storage.count(State), storage.count("State"))
+        self.assertEqual(storage.count(), len(storage.all()))
+
+    def test_delete_updates_class_partition(self):
+        '''
+            Verify deleted objects disappear from the class scoped view
+        '''
+        new_state = State(name="Ohio")
+        storage.new(new_state)
+        old_count = storage.count(State)
+        storage.delete(new_state)
+        key = "State.{}".format(new_state.id)
+        self.assertNotIn(key, storage.all(State))
+        self.assertEqual(old_count - 1, storage.count(State))
+
+    def test_get_missing(self):
+        '''
+            Verify get returns None for an unknown id
+        '''
+        self.assertIsNone(storage.get("State", "no-such-id"))
+        self.assertIsNone(storage.get(State, "no-such-id"))
+
+    def test_get_many(self):
+        '''
+            Verify get_many returns the found objects in the order asked
+        '''
+        first = State(name="Utah")
+        second = State(name="Idaho")
+        storage.new(first)
+        storage.new(second)
+        result = storage.get_many(State, [second.id, "missing", first.id])
+        self.assertEqual(result, [second, first])
+
+    def test_new_many(self):
+        '''
+            Verify new_many stores every object with a single write
+        '''
+        states = [State(name="Bulk{}".format(i)) for i in range(3)]
+        with mock.patch.object(FileStorage, "save") as save:
+            storage.new_many(states)
+        save.assert_called_once_with()
+        for state in states:
+            self.assertIs(storage.get(State, state.id), state)
+
+    def test_update_many(self):
+        '''
+            Verify update_many sets the attributes and keeps the
+            indexes up to date
+        '''
+        first = Place(name="Cabin", price_by_night=50)
+        second = Place(name="Loft", price_by_night=70)
+        storage.new_many([first, second])
+        old = first.updated_at
+        storage.update_many(Place, {first.id: {"price_by_night": 500},
+                                    "missing": {"price_by_night": 1}})
+        self.assertEqual(first.price_by_night, 500)
+        self.assertGreaterEqual(first.updated_at, old)
+        self.assertEqual(second.price_by_night, 70)
+        found = storage.query(Place, where={"price_by_night": {"gte": 400}})
+        self.assertIn(first, found)
+        self.assertNotIn(second, found)
+        for attr in ("id", "__class__"):
+            with self.assertRaises(ValueError):
+                storage.update_many(Place, {first.id: {attr: "x"}})
+        self.assertIs(storage.get(Place, first.id), first)
+
+    def test_load_option(self):
+        '''
+            Verify the load option is accepted and changes no result
+        '''
+        new_state = State(name="Maine")
+        storage.new(new_state)
+        storage.new(City(name="Portland", state_id=new_state.id))
+        self.assertEqual(storage.query(State, load="cities"),
+                         storage.query(State))
+        self.assertIs(storage.get(State, new_state.id, load="cities"),
+                      new_state)
+        self.assertEqual(storage.get_many(State, [new_state.id],
+                                          load={"cities": "joined"}),
+                         [new_state])
+
+
+@unittest.skipIf(db in ('db', 'sqlite'), "Testing DBstorage only")
+class testFileStorageJournal(unittest.TestCase):
+    '''
+        Examining FileStorage in journal mode
+    '''
+
+    def setUp(self):
+        '''
+            Switch the storage to journal mode on a fresh file
+        '''
+        self.storage = FileStorage()
+        self.storage.compact()
+        FileStorage._FileStorage__journal = True
+
+    def tearDown(self):
+        '''
+            Restore snapshot mode and tidy up
+        '''
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__journal_limit = 1024 * 1024
+        for path in ("file.json", "file.json.log"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def test_save_appends_records(self):
+        '''
+            Verify save() appends only the changed objects to the log
+        '''
+        new_state = State(name="Nevada")
+        self.storage.new(new_state)
+        self.storage.save()
+        self.storage.save()
+        with open("file.json.log", encoding="UTF8") as fd:
+            records = [json.loads(line) for line in fd]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["op"], "put")
+        self.assertEqual(records[0]["key"], "State." + new_state.id)
+
+    def test_save_records_changed_attribute(self):
+        '''
+            Verify an edited object is journaled without calling new()
+        '''
+        new_state = State(name="Oklahoma")
+        self.storage.new(new_state)
+        self.storage.save()
+        new_state.name = "Arkansas"
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(self.storage.get("State", new_state.id).name,
+                         "Arkansas")
+
+    def test_reload_replays_log(self):
+        '''
+            Verify reload() applies puts and deletes from the log
+        '''
+        kept = State(name="Maine")
+        gone = State(name="Iowa")
+        self.storage.new(kept)
+        self.storage.new(gone)
+        self.storage.save()
+        self.storage.delete(gone)
+        self.storage.reload()
+        self.assertIsNotNone(self.storage.get("State", kept.id))
+        self.assertIsNone(self.storage.get("State", gone.id))
+
+    def test_save_after_torn_record(self):
+        '''
+            Verify a record torn by a crash does not hide the records
+            appended after it
+        '''
+        first = State(name="Kansas")
+        self.storage.new(first)
+        self.storage.save()
+        with open("file.json.log", "a", encoding="UTF8") as fd:
+            fd.write('{"op": "put", "key": "State.torn", "val')
+        self.storage.reload()
+        second = State(name="Texas")
+        self.storage.new(second)
+        self.storage.save()
+        self.storage.reload()
+        self.assertIsNotNone(self.storage.get("State", first.id))
+        self.assertIsNotNone(self.storage.get("State", second.id))
+        with open("file.json.log", encoding="UTF8") as fd:
+            records = [json.loads(line) for line in fd]
+        self.assertEqual(len(records), 2)
+
+    def test_close_replays_new_records_only(self):
+        '''
+            Verify close() applies records appended by another writer
+            and keeps the objects it already had
+        '''
+        kept = State(name="Vermont")
+        self.storage.new(kept)
+        self.storage.save()
+        other = State(name="Georgia")
+        record = {"op": "put", "key": "State." + other.id,
+                  "value": other.to_dict()}
+        with open("file.json.log", "a", encoding="UTF8") as fd:
+            fd.write(json.dumps(record) + "\n")
+        self.storage.close()
+        self.assertIs(self.storage.get("State", kept.id), kept)
+        self.assertIsNotNone(self.storage.get("State", other.id))
+
+    def test_compaction(self):
+        '''
+            Verify the log is folded into the snapshot past the limit
+        '''
+        FileStorage._FileStorage__journal_limit = 1
+        new_state = State(name="Alaska")
+        self.storage.new(new_state)
+        self.storage.save()
+        self.assertFalse(os.path.exists("file.json.log"))
+        with open("file.json", encoding="UTF8") as fd:
+            content = json.load(fd)
+        self.assertIn("State." + new_state.id, content)
+
+
+@unittest.skipIf(db in ('db', 'sqlite'), "Testing DBstorage only")
+class testFileStorageGroupCommit(unittest.TestCase):
+    '''
+        Examining atomic snapshots and group commit in FileStorage
+    '''
+
+    def setUp(self):
+        '''
+            Start from no file on disk
+        '''
+        self.storage = FileStorage()
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def tearDown(self):
+        '''
+            Restore immediate saves and tidy up
+        '''
+        self.storage.flush()
+        FileStorage._FileStorage__commit_window = 0
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def test_save_leaves_no_temp_file(self):
+        '''
+            Verify the snapshot is renamed into place
+        '''
+        self.storage.save()
+        self.assertTrue(os.path.isfile("file.json"))
+        leftovers = [f for f in os.listdir(".") if f.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+    def test_group_commit_defers_write(self):
+        '''
+            Verify saves are coalesced until the window ends or flush()
+        '''
+        FileStorage._FileStorage__commit_window = 60
+        self.storage.new(State(name="Kansas"))
+        self.storage.save()
+        self.storage.save()
+        self.assertFalse(os.path.isfile("file.json"))
+        self.storage.flush()
+        self.assertTrue(os.path.isfile("file.json"))
+
+    def test_reload_keeps_pending_saves(self):
+        '''
+            Verify reload() writes the saves waiting for the window
+            instead of dropping them
+        '''
+        FileStorage._FileStorage__commit_window = 60
+        new_state = State(name="Nebraska")
+        new_state.save()
+        self.storage.reload()
+        self.assertIsNotNone(self.storage.get(State, new_state.id))
+        self.assertTrue(os.path.isfile("file.json"))
+
+    def test_group_commit_timer(self):
+        '''
+            Verify the background flusher writes after the window
+        '''
+        FileStorage._FileStorage__commit_window = 0.01
+        self.storage.save()
+        time.sleep(0.2)
+        self.assertTrue(os.path.isfile("file.json"))
+
+
+@unittest.skipIf(db in ('db', 'sqlite'), "Testing DBstorage only")
+class testFileStorageLazy(unittest.TestCase):
+    '''
+        Examining FileStorage with lazy hydration
+    '''
+
+    def setUp(self):
+        '''
+            Save two states and reload them lazily
+        '''
+        self.storage = FileStorage()
+        self.first = State(name="Hawaii")
+        self.second = State(name="Alabama")
+        self.storage.new(self.first)
+        self.storage.new(self.second)
+        self.storage.save()
+        FileStorage._FileStorage__lazy = True
+        self.storage.reload()
+
+    def tearDown(self):
+        '''
+            Leave lazy mode and tidy up
+        '''
+        FileStorage._FileStorage__lazy = False
+        self.storage.all()
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def test_reload_keeps_dicts(self):
+        '''
+            Verify nothing is built until it is asked for
+        '''
+        key = "State." + self.first.id
+        raw = self.storage._FileStorage__objects[key]
+        self.assertIs(type(raw), dict)
+        self.assertEqual(self.storage.count("State"),
+                         len(self.storage._FileStorage__classes["State"]))
+
+    def test_get_builds_once(self):
+        '''
+            Verify get() builds the instance and then reuses it
+        '''
+        obj = self.storage.get("State", self.first.id)
+        self.assertIsInstance(obj, State)
+        self.assertIs(self.storage.get("State", self.first.id), obj)
+        key = "State." + self.second.id
+        self.assertIs(type(self.storage._FileStorage__objects[key]), dict)
+
+    def test_all_builds_class(self):
+        '''
+            Verify all(cls) only hands out instances
+        '''
+        for obj in self.storage.all(State).values():
+            self.assertIsInstance(obj, State)
+
+    def test_save_unbuilt_objects(self):
+        '''
+            Verify objects never built are still written back
+        '''
+        self.storage.save()
+        with open("file.json", encoding="UTF8") as fd:
+            content = json.load(fd)
+        self.assertEqual(content["State." + self.second.id]["name"],
+                         "Alabama")
+
+
+@unittest.skipIf(db in ('db', 'sqlite'), "Testing DBstorage only")
+class testFileStorageStreaming(unittest.TestCase):
+    '''
+        Examining the incremental snapshot reader and NDJSON snapshots
+    '''
+
+    def tearDown(self):
+        '''
+            Back to the JSON format and tidy up
+        '''
+        FileStorage._FileStorage__format = "json"
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def test_iter_json_object_small_chunks(self):
+        '''
+            Verify entries split across reads are decoded as json.load does
+        '''
+        content = {"a.1": {"name": "x}, {\"y\"", "n": [1, 22, 333]},
+                   "b.2": {"f": 1.5e10, "t": None}, "c.3": {}}
+        text = json.dumps(content)
+        for size in (1, 7, 64):
+            result = dict(_iter_json_object(io.StringIO(text), size))
+            self.assertEqual(result, content)
+        self.assertEqual(dict(_iter_json_object(io.StringIO(" { } "))), {})
+
+    def test_iter_json_object_truncated(self):
+        '''
+            Verify a truncated document raises instead of loading partly
+        '''
+        text = json.dumps({"a.1": {"name": "x"}, "b.2": {"name": "y"}})
+        with self.assertRaises(ValueError):
+            list(_iter_json_object(io.StringIO(text[:-5]), 8))
+
+    def test_ndjson_round_trip(self):
+        '''
+            Verify NDJSON snapshots are written one object per line
+        '''
+        FileStorage._FileStorage__format = "ndjson"
+        fs = FileStorage()
+        new_state = State(name="Delaware")
+        fs.new(new_state)
+        fs.save()
+        with open("file.json", encoding="UTF8") as fd:
+            lines = [json.loads(line) for line in fd]
+        self.assertEqual(len(lines), fs.count())
+        fs.reload()
+        self.assertEqual(fs.get("State", new_state.id).name, "Delaware")
+
+
+@unittest.skipIf(db in ('db', 'sqlite'), "Testing DBstorage only")
+class testFileStorageShards(unittest.TestCase):
+    '''
+        Examining FileStorage with one snapshot file per class
+    '''
+
+    def setUp(self):
+        '''
+            Point the storage at an empty shard directory
+        '''
+        self.tmp_dir = tempfile.mkdtemp()
+        self.shard_dir = os.path.join(self.tmp_dir, "data")
+        self.saved = (FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__classes)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__shard_dir = self.shard_dir
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        '''
+            Back to a single file and tidy up
+        '''
+        FileStorage._FileStorage__shard_dir = None
+        FileStorage._FileStorage__shards = 1
+        FileStorage._FileStorage__load_workers = 1
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__classes) = self.saved
+        shutil.rmtree(self.tmp_dir)
+
+    def test_one_file_per_class(self):
+        '''
+            Verify each class is saved to its own shard
+        '''
+        self.storage.new(State(name="Ohio"))
+        self.storage.new(City(name="Akron"))
+        self.storage.compact()
+        names = os.listdir(self.shard_dir)
+        self.assertIn("State.json", names)
+        self.assertIn("City.json", names)
+
+    def test_save_rewrites_dirty_shards_only(self):
+        '''
+            Verify a save leaves the shards of unchanged classes alone
+        '''
+        self.storage.new(State(name="Ohio"))
+        self.storage.new(City(name="Akron"))
+        self.storage.compact()
+        city_path = os.path.join(self.shard_dir, "City.json")
+        state_path = os.path.join(self.shard_dir, "State.json")
+        city_inode = os.stat(city_path).st_ino
+        state_inode = os.stat(state_path).st_ino
+        self.storage.new(State(name="Iowa"))
+        self.storage.save()
+        self.assertEqual(os.stat(city_path).st_ino, city_inode)
+        self.assertNotEqual(os.stat(state_path).st_ino, state_inode)
+
+    def test_hash_partitions_reload(self):
+        '''
+            Verify hash partitioned shards load back in parallel
+        '''
+        FileStorage._FileStorage__shards = 4
+        FileStorage._FileStorage__load_workers = 4
+        states = [State(name=str(i)) for i in range(20)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.compact()
+        names = [n for n in os.listdir(self.shard_dir)
+                 if n.startswith("State.")]
+        self.assertTrue(len(names) > 1)
+        self.storage.reload()
+        for state in states:
+            self.assertEqual(self.storage.get("State", state.id).name,
+                             state.name)
+
+    def test_delete_last_object_removes_shard(self):
+        '''
+            Verify a shard with no objects left is removed
+        '''
+        city = City(name="Dayton")
+        self.storage.new(city)
+        self.storage.save()
+        self.storage.delete(city)
+        names = os.listdir(self.shard_dir)
+        self.assertNotIn("City.json", names)
+
+    def test_checkpoint_keeps_replayed_records(self):
+        '''
+            Verify a checkpoint after a restart writes the shards of the
+            journal records it replayed before removing the journal
+        '''
+        FileStorage._FileStorage__journal = True
+        try:
+            self.storage.compact()
+            amenity = Amenity(name="Sauna")
+            self.storage.new(amenity)
+            self.storage.save()
+            # a restart: the new process replays the journal
+            self.storage.reload()
+            FileStorage._FileStorage__journal_limit = 1
+            self.storage.new(State(name="Utah"))
+            self.storage.save()
+            self.assertFalse(os.path.exists(
+                self.storage._FileStorage__journal_path()))
+            self.assertIn("Amenity.json", os.listdir(self.shard_dir))
+            self.storage.reload()
+            self.assertEqual(self.storage.get(Amenity, amenity.id).name,
+                             "Sauna")
+        finally:
+            FileStorage._FileStorage__journal = False
+            FileStorage._FileStorage__journal_limit = 1024 * 1024
+
+
+@unittest.skipIf(db in ('db', 'sqlite'), "Testing DBstorage only")
+class testFileStorageThreads(unittest.TestCase):
+    '''
+        Examining FileStorage used by several threads at once
+    '''
+
+    def setUp(self):
+        '''
+            launching the classes
+        '''
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        '''
+            Tiding up.
+        '''
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def run_threads(self, targets):
+        '''
+            Run each target in its own thread and re-raise the first
+            error any of them hit
+        '''
+        errors = []
+
+        def run(target):
+            try:
+                target()
+            except Exception as err:
+                errors.append(err)
+        threads = [threading.Thread(target=run, args=(target,))
+                   for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def test_readers_share_the_lock(self):
+        '''
+            Verify two threads can hold the read lock together
+        '''
+        lock = _RWLock()
+        both = threading.Barrier(2, timeout=5)
+
+        def read():
+            with lock.reading():
+                both.wait()
+        self.run_threads([read, read])
+
+    def test_writer_excludes_readers(self):
+        '''
+            Verify a reader waits for the writer to finish
+        '''
+        lock = _RWLock()
+        events = []
+        writing = threading.Event()
+
+        def write():
+            with lock.writing():
+                writing.set()
+                time.sleep(0.05)
+                events.append("write")
+
+        def read():
+            writing.wait()
+            with lock.reading():
+                events.append("read")
+        self.run_threads([write, read])
+        self.assertEqual(events, ["write", "read"])
+
+    def test_all_returns_a_copy(self):
+        '''
+            Verify changing the dict from all() leaves the store alone
+        '''
+        state = State(name="Utah")
+        self.storage.new(state)
+        objs = self.storage.all()
+        objs.clear()
+        self.assertIs(self.storage.get("State", state.id), state)
+
+    def test_concurrent_new_and_all(self):
+        '''
+            Verify readers iterate safely while writers add objects
+        '''
+        before = self.storage.count("State")
+
+        def write():
+            for i in range(200):
+                self.storage.new(State(name=str(i)))
+
+        def read():
+            for i in range(200):
+                for obj in self.storage.all().values():
+                    pass
+                self.storage.count("State")
+        self.run_threads([write, write, read, read])
+        self.assertEqual(self.storage.count("State"), before + 400)
+
+    def test_reload_is_never_half_done(self):
+        '''
+            Verify readers see the whole store while reload() runs
+        '''
+        for i in range(50):
+            self.storage.new(State(name=str(i)))
+        self.storage.save()
+        total = self.storage.count("State")
+        seen = []
+
+        def reload():
+            for i in range(20):
+                self.storage.reload()
+
+        def read():
+            for i in range(200):
+                seen.append(self.storage.count("State"))
+        self.run_threads([reload, read, read])
+        self.assertEqual(set(seen), {total})
+
+
+@unittest.skipIf(db in ('db', 'sqlite'), "Testing DBstorage only")
+class testFileStorageShared(unittest.TestCase):
+    '''
+        Examining FileStorage shared by several processes
+    '''
+
+    def setUp(self):
+        '''
+            Start from empty files in shared journal mode
+        '''
+        FileStorage._FileStorage__shared = True
+        FileStorage._FileStorage__journal = True
+        self.storage = FileStorage()
+        self.storage.compact()
+
+    def tearDown(self):
+        '''
+            Back to a single process and tidy up
+        '''
+        FileStorage._FileStorage__shared = False
+        FileStorage._FileStorage__journal = False
+        for path in ("file.json", "file.json.log", "file.json.lock"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def other_process(self, name, journal=True):
+        '''
+            Save a State from another process and return its id
+        '''
+        env = dict(os.environ, HBNB_FS_SHARED="1",
+                   HBNB_FS_JOURNAL="1" if journal else "0")
+        env.pop("HBNB_TYPE_STORAGE", None)
+        code = ("from models.state import State\n"
+                "state = State(name={!r})\n"
+                "state.save()\n"
+                "print(state.id)\n").format(name)
+        out = subprocess.check_output([sys.executable, "-c", code], env=env,
+                                      cwd=os.getcwd())
+        return out.decode().strip()
+
+    def test_close_tails_the_journal(self):
+        '''
+            Verify close() picks up another process's save without
+            reloading the objects already loaded
+        '''
+        mine = State(name="Oregon")
+        mine.save()
+        other_id = self.other_process("Nevada")
+        self.storage.close()
+        self.assertEqual(self.storage.get("State", other_id).name, "Nevada")
+        self.assertIs(self.storage.get("State", mine.id), mine)
+
+    def test_save_keeps_other_process_changes(self):
+        '''
+            Verify a snapshot write does not drop another process's save
+        '''
+        FileStorage._FileStorage__journal = False
+        mine = State(name="Oregon")
+        mine.save()
+        other_id = self.other_process("Nevada", journal=False)
+        later = State(name="Idaho")
+        later.save()
+        with open("file.json", encoding="UTF8") as fd:
+            keys = json.load(fd).keys()
+        for obj_id in (mine.id, other_id, later.id):
+            self.assertIn("State." + obj_id, keys)
+
+    def test_catch_up_keeps_unsaved_changes(self):
+        '''
+            Verify close() keeps the objects that are not saved yet
+        '''
+        FileStorage._FileStorage__journal = False
+        pending = State(name="Utah")
+        self.storage.new(pending)
+        other_id = self.other_process("Nevada", journal=False)
+        self.storage.close()
+        self.assertIs(self.storage.get("State", pending.id), pending)
+        self.assertIsNotNone(self.storage.get("State", other_id))
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+'''
+    Examining the module for the geospatial index.
+'''
+
+import unittest
+from models.engine.geo_index import GeoIndex, bounding_box, distance
+
+
+class testGeoIndex(unittest.TestCase):
+    '''
+        Examining the GeoIndex category
+    '''
+
+    def setUp(self):
+        '''
+            launching the index
+        '''
+        self.index = GeoIndex()
+        self.index.add("Place.sf", {"latitude": 37.77, "longitude": -122.42})
+        self.index.add("Place.oak", {"latitude": 37.80, "longitude": -122.27})
+        self.index.add("Place.la", {"latitude": 34.05, "longitude": -118.24})
+        self.index.add("Place.fiji", {"latitude": -17.7, "longitude": 179.9})
+        self.index.add("Place.none", {"name": "nowhere"})
+        self.index.add("City.sf", {"latitude": 37.77, "longitude": -122.42})
+
+    def test_distance(self):
+        '''
+            Verify the distance between San Francisco and Los Angeles
+        '''
+        self.assertAlmostEqual(distance(37.77, -122.42, 34.05, -118.24),
+                               559, delta=2)
+
+    def test_bounding_box_wraps(self):
+        '''
+            Verify a box across the antimeridian has west > east
+        '''
+        south, west, north, east = bounding_box(-17.7, 179.9, 50)
+        self.assertTrue(west > east)
+
+    def test_near_orders_by_distance(self):
+        '''
+            Verify near() keeps the places in the radius, nearest first
+        '''
+        found = self.index.near(37.78, -122.40, 20)
+        self.assertEqual([key for key, dist in found],
+                         ["Place.sf", "Place.oak"])
+        found = self.index.near(37.78, -122.40, 1000, limit=1)
+        self.assertEqual([key for key, dist in found], ["Place.sf"])
+
+    def test_near_across_antimeridian(self):
+        '''
+            Verify near() finds places on the other side of 180 degrees
+        '''
+        found = self.index.near(-17.7, -179.9, 50)
+        self.assertEqual([key for key, dist in found], ["Place.fiji"])
+
+    def test_within(self):
+        '''
+            Verify within() returns the places inside the box
+        '''
+        keys = self.index.within(30, -125, 40, -115)
+        self.assertEqual(sorted(keys), ["Place.la", "Place.oak", "Place.sf"])
+
+    def test_move_and_remove(self):
+        '''
+            Verify the index follows moved and removed places
+        '''
+        self.index.add("Place.la", {"latitude": 37.76, "longitude": -122.41})
+        self.assertEqual(self.index.within(34, -119, 35, -118), [])
+        self.assertIn("Place.la",
+                      [key for key, dist in self.index.near(37.77, -122.42,
+                                                            5)])
+        self.index.remove("Place.la")
+        self.assertNotIn("Place.la", self.index.within(30, -125, 40, -115))
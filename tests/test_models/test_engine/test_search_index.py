@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+'''
+    Examining the module for the search index.
+'''
+
+import unittest
+from models.engine.search_index import SearchIndex
+
+
+class testSearchIndex(unittest.TestCase):
+    '''
+        Examining the SearchIndex category
+    '''
+
+    def setUp(self):
+        '''
+            launching the index
+        '''
+        self.index = SearchIndex()
+        self.index.add("Place.1", {"name": "Sunny loft",
+                                   "description": "Loft by the beach"})
+        self.index.add("Place.2", {"name": "Cabin",
+                                   "description": "Quiet cabin, no beach"})
+        self.index.add("Review.1", {"text": "The loft was sunny and warm"})
+        self.index.add("City.1", {"name": "Loft"})
+
+    def test_ranks_by_relevance(self):
+        '''
+            Verify the object using the words most comes first
+        '''
+        found = self.index.search("sunny loft")
+        self.assertEqual([key for key, score in found][:2],
+                         ["Place.1", "Review.1"])
+        self.assertTrue(found[0][1] >= found[1][1])
+
+    def test_only_text_classes(self):
+        '''
+            Verify classes without text fields are left out
+        '''
+        keys = [key for key, score in self.index.search("loft")]
+        self.assertNotIn("City.1", keys)
+
+    def test_classes_and_limit(self):
+        '''
+            Verify results can be limited to classes and a count
+        '''
+        found = self.index.search("beach loft", classes=["Place"], limit=1)
+        self.assertEqual([key for key, score in found], ["Place.1"])
+
+    def test_update_and_remove(self):
+        '''
+            Verify the index follows changed and removed objects
+        '''
+        self.index.add("Place.2", {"name": "Cabin", "description": "woods"})
+        self.assertEqual(self.index.search("woods")[0][0], "Place.2")
+        self.assertNotIn("Place.2",
+                         [key for key, score in self.index.search("beach")])
+        self.index.remove("Place.2")
+        self.assertEqual(self.index.search("woods"), [])
+
+    def test_no_words(self):
+        '''
+            Verify a query without words finds nothing
+        '''
+        self.assertEqual(self.index.search("  ,. "), [])
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+'''
+    Examining the module for the sorted index.
+'''
+
+import unittest
+from models.engine.sorted_index import SortedIndex
+
+
+class testSortedIndex(unittest.TestCase):
+    '''
+        Examining the SortedIndex category
+    '''
+
+    def setUp(self):
+        '''
+            launching the index
+        '''
+        self.index = SortedIndex()
+        for i, price in enumerate([50, 10, 30, 30, 70]):
+            self.index.add("Place.{}".format(i), price)
+        self.index.add("Place.free", None)
+
+    def test_range_bounds(self):
+        '''
+            Verify inclusive and exclusive bounds
+        '''
+        self.assertEqual(self.index.range(gte=30, lte=50),
+                         ["Place.2", "Place.3", "Place.0"])
+        self.assertEqual(self.index.range(gt=30, lt=70), ["Place.0"])
+        self.assertEqual(self.index.range(lte=10), ["Place.1"])
+        self.assertEqual(self.index.range(gte=100), [])
+
+    def test_ignores_non_numbers(self):
+        '''
+            Verify values that are not numbers are left out
+        '''
+        self.index.add("Place.text", "cheap")
+        self.index.add("Place.flag", True)
+        self.assertEqual(len(self.index), 5)
+
+    def test_move_and_remove(self):
+        '''
+            Verify the index follows changed and removed values
+        '''
+        self.index.add("Place.3", 80)
+        self.assertEqual(self.index.range(gte=30, lte=30), ["Place.2"])
+        self.assertEqual(self.index.range(gt=70), ["Place.3"])
+        self.index.remove("Place.3")
+        self.index.add("Place.2", None)
+        self.assertEqual(self.index.range(gte=30), ["Place.0", "Place.4"])
+
+    def test_build_from_items(self):
+        '''
+            Verify an index built from pairs matches one added to
+        '''
+        items = [("Place.{}".format(i), price)
+                 for i, price in enumerate([50, 10, 30, 30, 70])]
+        index = SortedIndex(items + [("Place.free", None)])
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.range(gte=30, lte=50),
+                         self.index.range(gte=30, lte=50))
+        index.add("Place.1", 90)
+        self.assertEqual(index.range(gt=70), ["Place.1"])
@@ -0,0 +1,210 @@
+#!/usr/bin/python3
+'''
+    Examining the module for SQLite storage.
+'''
+import os
+import shutil
+import tempfile
+import unittest
+from os import getenv
+from sqlalchemy import text
+from models import storage
+from models.engine.sqlite_storage import SQLiteStorage
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.user import User
+
+db = getenv("HBNB_TYPE_STORAGE")
+
+
+@unittest.skipIf(db != 'sqlite', "Testing SQLiteStorage only")
+class test_SQLiteStorage(unittest.TestCase):
+    '''
+        SQLiteStorage class testing
+    '''
+
+    def test_model_storage(self):
+        '''
+            Check storage is SQLiteStorage instance by running test
+        '''
+        self.assertIsInstance(storage, SQLiteStorage)
+
+    def test_pragmas(self):
+        '''
+            Verify the connections enforce foreign keys and, on a file,
+            use WAL
+        '''
+        engine = storage._DBStorage__engine
+        with engine.connect() as connection:
+            mode = connection.execute(text("PRAGMA journal_mode")).scalar()
+            keys = connection.execute(text("PRAGMA foreign_keys")).scalar()
+        if getenv("HBNB_SQLITE_DB") != ":memory:":
+            self.assertEqual(mode, "wal")
+        self.assertEqual(keys, 1)
+
+    def test_memory(self):
+        '''
+            Verify an in-memory database is shared by the sessions
+        '''
+        memory = SQLiteStorage(":memory:")
+        memory.reload()
+        state = State(name="Nevada")
+        memory.new(state)
+        memory.save()
+        memory.close()
+        self.assertEqual(memory.get(State, state.id).name, "Nevada")
+        self.assertEqual(memory.count(), 1)
+        memory.close()
+
+    def test_new_save_get(self):
+        '''
+            Verify objects round trip through the database
+        '''
+        state = State(name="Oregon")
+        storage.new(state)
+        storage.new(City(name="Salem", state_id=state.id))
+        storage.save()
+        storage.close()
+        found = storage.get("State", state.id)
+        self.assertEqual(found.name, "Oregon")
+        self.assertEqual([city.name for city in found.cities], ["Salem"])
+
+    def test_update_many(self):
+        '''
+            Verify update_many leaves the loaded objects readable once
+            the session is closed, and refuses to change the id
+        '''
+        memory = SQLiteStorage(":memory:")
+        memory.reload()
+        state = State(name="Nevada")
+        memory.new(state)
+        memory.save()
+        memory.update_many(State, {state.id: {"name": "Utah"}})
+        memory.close()
+        self.assertEqual(state.name, "Utah")
+        self.assertEqual(memory.get(State, state.id).name, "Utah")
+        with self.assertRaises(ValueError):
+            memory.update_many(State, {state.id: {"id": "other"}})
+        memory.close()
+
+    def test_search_shared(self):
+        '''
+            Verify search() sees the writes of another storage on the
+            same file at once, and reindex() repairs it after a VACUUM
+        '''
+        tmp = tempfile.mkdtemp()
+        path = os.path.join(tmp, "shared.db")
+        writer, reader = SQLiteStorage(path), SQLiteStorage(path)
+        writer.reload()
+        reader.reload()
+        user = User(email="host@hbnb.io", password="pwd")
+        state = State(name="Utah")
+        city = City(name="Moab", state_id=state.id)
+        place = Place(name="Desert cabin", city_id=city.id, user_id=user.id)
+        writer.new_many([user, state, city, place])
+        self.assertEqual([p.id for p in reader.search("cabin")], [place.id])
+        writer.update_many(Place, {place.id: {"name": "Desert loft"}})
+        self.assertEqual(reader.search("cabin"), [])
+        self.assertEqual([p.id for p in reader.search("loft", cls=Place)],
+                         [place.id])
+        reader.close()
+        with writer._DBStorage__engine.connect() as connection:
+            connection.exec_driver_sql("VACUUM")
+        writer.reindex()
+        self.assertEqual([p.id for p in reader.search("loft")], [place.id])
+        writer.delete(writer.get(Place, place.id))
+        writer.save()
+        self.assertEqual(reader.search("loft"), [])
+        for one in (writer, reader):
+            one.close()
+            one._DBStorage__engine.dispose()
+        shutil.rmtree(tmp)
+
+    def test_explain(self):
+        '''
+            Verify the queries of the API use indexes, and that a
+            missing index is reported and created again by reload
+        '''
+        report = storage.explain()
+        self.assertTrue(report)
+        self.assertEqual([entry for entry in report
+                          if entry["full_scans"]], [])
+        with storage._DBStorage__engine.begin() as connection:
+            connection.execute(text("DROP INDEX ix_reviews_place_id"))
+        scans = [entry["full_scans"] for entry in storage.explain()]
+        self.assertIn(["reviews"], scans)
+        storage.reload()
+        self.assertEqual([entry for entry in storage.explain()
+                          if entry["full_scans"]], [])
+
+
+@unittest.skipIf(db != 'sqlite', "Testing SQLiteStorage only")
+class test_SQLiteStorageReplicas(unittest.TestCase):
+    '''
+        Read replica routing, with SQLite files standing in for the
+        primary and the replicas
+    '''
+
+    def setUp(self):
+        '''
+            Build a storage on a primary and two replicas
+        '''
+        self.tmp = tempfile.mkdtemp()
+        paths = [os.path.join(self.tmp, name)
+                 for name in ("primary.db", "replica1.db", "replica2.db")]
+        # reload() only builds the primary; real replicas would get
+        # the schema, full-text tables too, by replication
+        for path in paths[1:]:
+            replica = SQLiteStorage(path)
+            replica.reload()
+            replica.close()
+            replica._DBStorage__engine.dispose()
+        self.storage = SQLiteStorage(paths[0], paths[1:])
+        self.storage.reload()
+
+    def tearDown(self):
+        '''
+            Remove the database files
+        '''
+        self.storage.close()
+        shutil.rmtree(self.tmp)
+
+    def test_reads_go_to_replicas(self):
+        '''
+            Verify a new session reads from the replicas, which never
+            see the writes here
+        '''
+        self.storage.new(State(name="Utah"))
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.count(State), 0)
+        self.storage.close()
+        self.assertEqual(self.storage.all(State), {})
+
+    def test_search_reads_replicas(self):
+        '''
+            Verify search() reads from a replica and leaves the session
+            reading from it
+        '''
+        self.storage.new(State(name="Utah"))
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.search("anything"), [])
+        self.assertEqual(self.storage.count(State), 0)
+
+    def test_read_your_writes(self):
+        '''
+            Verify a session reads from the primary once it has written
+        '''
+        state = State(name="Idaho")
+        self.storage.new(state)
+        self.assertEqual(self.storage.count(State), 1)
+        self.storage.save()
+        self.assertIs(self.storage.get(State, state.id), state)
+
+    def test_pool_stats(self):
+        '''
+            Verify the replicas report their pools too
+        '''
+        self.assertEqual(len(self.storage.pool_stats()["replicas"]), 2)
@@ -7,6 +7,9 @@
 import unittest
 from models.base_model import BaseModel
 from models.place import Place
+from models.amenity import Amenity
+from models.review import Review
+from models import storage as file_storage
 from os import getenv, remove
 
 storage = getenv("HBNB_TYPE_STORAGE", "fs")
@@ -72,7 +75,8 @@ class TestUser(unittest.TestCase):
         self.assertTrue("latitude" in self.new_place.__dir__())
         self.assertTrue("longitude" in self.new_place.__dir__())
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_place_amenity_attrb(self):
         self.assertTrue("amenity_ids" in self.new_place.__dir__())
 
@@ -81,7 +85,8 @@ class TestUser(unittest.TestCase):
         self.assertTrue("amenities" in self.new_place.__dir__())
         self.assertTrue("reviews" in self.new_place.__dir__())
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_longitude(self):
         '''
             Check the longitude type
@@ -89,7 +94,8 @@ class TestUser(unittest.TestCase):
         longitude = getattr(self.new_place, "longitude")
         self.assertIsInstance(longitude, float)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_latitude(self):
         '''
             Check the latitude type
@@ -97,7 +103,8 @@ class TestUser(unittest.TestCase):
         latitude = getattr(self.new_place, "latitude")
         self.assertIsInstance(latitude, float)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_amenity(self):
         '''
             Check the kind of latitude
@@ -105,7 +112,8 @@ class TestUser(unittest.TestCase):
         amenity = getattr(self.new_place, "amenity_ids")
         self.assertIsInstance(amenity, list)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_price_by_night(self):
         '''
             Check the price_by_night type
@@ -113,7 +121,8 @@ class TestUser(unittest.TestCase):
         price_by_night = getattr(self.new_place, "price_by_night")
         self.assertIsInstance(price_by_night, int)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_max_guest(self):
         '''
             Verify the max_guest type
@@ -121,7 +130,8 @@ class TestUser(unittest.TestCase):
         max_guest = getattr(self.new_place, "max_guest")
         self.assertIsInstance(max_guest, int)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_number_bathrooms(self):
         '''
             Check the number_bathrooms type
@@ -129,7 +139,8 @@ class TestUser(unittest.TestCase):
         number_bathrooms = getattr(self.new_place, "number_bathrooms")
         self.assertIsInstance(number_bathrooms, int)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_number_rooms(self):
         '''
             Test the number_bathrooms type
@@ -137,7 +148,8 @@ class TestUser(unittest.TestCase):
         number_rooms = getattr(self.new_place, "number_rooms")
         self.assertIsInstance(number_rooms, int)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_description(self):
         '''
             Try out different types of descriptions
@@ -145,7 +157,8 @@ class TestUser(unittest.TestCase):
         description = getattr(self.new_place, "description")
         self.assertIsInstance(description, str)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_name(self):
         '''
             Try out different names
@@ -153,7 +166,8 @@ class TestUser(unittest.TestCase):
         name = getattr(self.new_place, "name")
         self.assertIsInstance(name, str)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_user_id(self):
         '''
             Check the user_id type.
@@ -161,10 +175,37 @@ class TestUser(unittest.TestCase):
         user_id = getattr(self.new_place, "user_id")
         self.assertIsInstance(user_id, str)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_city_id(self):
         '''
             Check the city_id type
         '''
         city_id = getattr(self.new_place, "city_id")
         self.assertIsInstance(city_id, str)
+
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
+    def test_amenities_setter(self):
+        '''
+            Verify only amenities are linked, each of them once
+        '''
+        place = Place(name="cabin")
+        amenity = Amenity(name="Wifi")
+        file_storage.new(amenity)
+        place.amenities = amenity
+        place.amenities = amenity
+        place.amenities = Review()
+        self.assertEqual(place.amenity_ids, [amenity.id])
+        self.assertEqual(place.amenities, [amenity])
+        self.assertEqual(Place.amenity_ids, [])
+
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
+    def test_reviews_property(self):
+        '''
+            Verify reviews gives back the reviews of the place
+        '''
+        review = Review(text="cosy", place_id=self.new_place.id)
+        file_storage.new(review)
+        self.assertIn(review, self.new_place.reviews)
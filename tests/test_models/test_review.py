@@ -67,7 +67,8 @@ class TestReview(unittest.TestCase):
         self.assertTrue("user_id" in self.rev.__dir__())
         self.assertTrue("text" in self.rev.__dir__())
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_Review_attributes(self):
         '''
             Verify that the review class has text
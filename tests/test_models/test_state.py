@@ -5,6 +5,8 @@
 import unittest
 from models.base_model import BaseModel
 from models.state import State
+from models.city import City
+from models import storage as file_storage
 from os import getenv, remove
 import pep8
 
@@ -53,10 +55,23 @@ class TestState(unittest.TestCase):
         '''
         self.assertTrue("name" in self.new_state.__dir__())
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_State_attributes_type(self):
         '''
             Verify name of State class attribute is class type str.
         '''
         name = getattr(self.new_state, "name")
         self.assertIsInstance(name, str)
+
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
+    def test_cities_property(self):
+        '''
+            Verify cities gives back the cities that refer to the state
+        '''
+        city = City(name="Fresno", state_id=self.new_state.id)
+        file_storage.new(city)
+        self.assertIn(city, self.new_state.cities)
+        file_storage.delete(city)
+        self.assertNotIn(city, self.new_state.cities)
@@ -64,7 +64,8 @@ class TestUser(unittest.TestCase):
         self.assertTrue("last_name" in self.new_user.__dir__())
         self.assertTrue("password" in self.new_user.__dir__())
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_email(self):
         '''
             Verify the name type
@@ -72,7 +73,8 @@ class TestUser(unittest.TestCase):
         name = getattr(self.new_user, "email")
         self.assertIsInstance(name, str)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_first_name(self):
         '''
             Check the name kind
@@ -80,7 +82,8 @@ class TestUser(unittest.TestCase):
         name = getattr(self.new_user, "first_name")
         self.assertIsInstance(name, str)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_last_name(self):
         '''
             Verify the last_name type
@@ -88,7 +91,8 @@ class TestUser(unittest.TestCase):
         name = getattr(self.new_user, "last_name")
         self.assertIsInstance(name, str)
 
-    @unittest.skipIf(storage == "db", "Testing database storage only")
+    @unittest.skipIf(storage in ("db", "sqlite"),
+                     "Testing database storage only")
     def test_type_password(self):
         '''
             Verify the password type
@@ -86,7 +86,7 @@ def html_fetch_states():
     """show HTML page, retrieve ordered
        states, and paste into UL tag
     """
-    state_objs = [s for s in storage.all("State").values()]
+    state_objs = storage.query("State", order_by="name")
     return render_template('7-states_list.html',
                            state_objs=state_objs)
 
@@ -97,7 +97,8 @@ def html_fetch_cities_by_states():
        get sorted states to add to an HTML UL tag.
        get ordered cities for each state into HTML file li Tag.
     """
-    state_objs = [s for s in storage.all("State").values()]
+    state_objs = storage.query("State", order_by="name",
+                               load="cities")
     return render_template('8-cities_by_states.html',
                            state_objs=state_objs)
 
@@ -107,10 +108,7 @@ def html_if_stateID(id):
     """show the HTML page; use state.name to customize the heading
        pull sorted cities for state ID into the HTML file li Tag.
     """
-    state_obj = None
-    for state in storage.all("State").values():
-        if state.id == id:
-            state_obj = state
+    state_obj = storage.get("State", id, load="cities")
     return render_template('9-states.html',
                            state_obj=state_obj)
 
@@ -120,8 +118,9 @@ def html_filters():
     """show HTML page with functional amenities, city and state filters
        use static CSS files for the web
     """
-    state_objs = [s for s in storage.all("State").values()]
-    amenity_objs = [a for a in storage.all("Amenity").values()]
+    state_objs = storage.query("State", order_by="name",
+                               load="cities")
+    amenity_objs = storage.query("Amenity", order_by="name")
     return render_template('10-hbnb_filters.html',
                            state_objs=state_objs, amenity_objs=amenity_objs)
 
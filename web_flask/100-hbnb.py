@@ -16,7 +16,7 @@ script starts Flask web app
             /hbnb:                show HTML w/ oper attrib amenity filter
 """
 from models import storage
-from flask import Flask, render_template
+from flask import Flask, render_template, request
 app = Flask(__name__)
 app.url_map.strict_slashes = False
 
@@ -89,7 +89,7 @@ def html_fetch_states():
     """shows html page
        get sorted states to add to an HTML UL tag.
     """
-    state_objs = [s for s in storage.all("State").values()]
+    state_objs = storage.query("State", order_by="name")
     return render_template('7-states_list.html',
                            state_objs=state_objs)
 
@@ -100,7 +100,8 @@ def html_fetch_cities_by_states():
        retrieve ordered states for the UL tag HTML insert.
        get ordered cities for state into HTML file LI tag.
     """
-    state_objs = [s for s in storage.all("State").values()]
+    state_objs = storage.query("State", order_by="name",
+                               load="cities")
     return render_template('8-cities_by_states.html',
                            state_objs=state_objs)
 
@@ -110,10 +111,7 @@ def html_if_stateID(id):
     """show HTML page; use state.name to customize the heading
        pull sorted cities for state ID into HTML file LI tag
     """
-    state_obj = None
-    for state in storage.all("State").values():
-        if state.id == id:
-            state_obj = state
+    state_obj = storage.get("State", id, load="cities")
     return render_template('9-states.html',
                            state_obj=state_obj)
 
@@ -123,8 +121,9 @@ def html_filters():
     """show HTML page with functional amenities and city, state filters
        use static CSS files for the web
     """
-    state_objs = [s for s in storage.all("State").values()]
-    amenity_objs = [a for a in storage.all("Amenity").values()]
+    state_objs = storage.query("State", order_by="name",
+                               load="cities")
+    amenity_objs = storage.query("Amenity", order_by="name")
     return render_template('10-hbnb_filters.html',
                            state_objs=state_objs, amenity_objs=amenity_objs)
 
@@ -133,18 +132,23 @@ def html_filters():
 def html_all_filters():
     """show an HTML page with functional city, state filters and properties
        use static CSS files for the web
+       ?amenities=<id>,<id> keeps the places having all those amenities
     """
-    state_objs = [s for s in storage.all("State").values()]
-    amenity_objs = [a for a in storage.all("Amenity").values()]
-    place_objs = [p for p in storage.all("Place").values()]
-    user_objs = [u for u in storage.all("User").values()]
+    state_objs = storage.query("State", order_by="name",
+                               load="cities")
+    amenity_objs = storage.query("Amenity", order_by="name")
+    where = {}
+    if request.args.get("amenities"):
+        where["amenity_ids"] = request.args["amenities"].split(",")
+    place_objs = storage.query("Place", where=where, order_by="name")
+    users = {user.id: user for user in storage.get_many(
+        "User", {place.user_id for place in place_objs})}
     place_owner_objs = []
     for place in place_objs:
-        for user in user_objs:
-            if place.user_id == user.id:
-                place_owner_objs.append(["{} {}".format(
-                    user.first_name, user.last_name), place])
-    place_owner_objs.sort(key=lambda p: p[1].name)
+        user = users.get(place.user_id)
+        if user is not None:
+            place_owner_objs.append(["{} {}".format(
+                user.first_name, user.last_name), place])
     return render_template('100-hbnb.html',
                            state_objs=state_objs,
                            amenity_objs=amenity_objs,
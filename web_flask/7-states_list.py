@@ -83,7 +83,7 @@ def html_fetch_states():
     """shows html page
        fetch states to put into html of UL tag
     """
-    state_objs = [s for s in storage.all("State").values()]
+    state_objs = storage.query("State", order_by="name")
     return render_template('7-states_list.html',
                            state_objs=state_objs)
 
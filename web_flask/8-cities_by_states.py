@@ -84,7 +84,7 @@ def html_fetch_states():
     """shows html page
        fetch states to put into html of UL tag
     """
-    state_objs = [s for s in storage.all("State").values()]
+    state_objs = storage.query("State", order_by="name")
     return render_template('7-states_list.html',
                            state_objs=state_objs)
 
@@ -95,7 +95,8 @@ def html_fetch_cities_by_states():
        get sorted states to add to an HTML UL tag.
        get ordered cities for state into LI tag HTML file
     """
-    state_objs = [s for s in storage.all("State").values()]
+    state_objs = storage.query("State", order_by="name",
+                               load="cities")
     return render_template('8-cities_by_states.html',
                            state_objs=state_objs)
 
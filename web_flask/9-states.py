@@ -85,7 +85,7 @@ def html_fetch_states():
     """shows html page
        fetch states to put into html of UL tag
     """
-    state_objs = [s for s in storage.all("State").values()]
+    state_objs = storage.query("State", order_by="name")
     return render_template('7-states_list.html',
                            state_objs=state_objs)
 
@@ -96,7 +96,8 @@ def html_fetch_cities_by_states():
        get states to add to an HTML UL tag
        get ordered cities for state into LI tag HTML file
     """
-    state_objs = [s for s in storage.all("State").values()]
+    state_objs = storage.query("State", order_by="name",
+                               load="cities")
     return render_template('8-cities_by_states.html',
                            state_objs=state_objs)
 
@@ -106,10 +107,7 @@ def html_if_stateID(id):
     """shows html page; with state.name
        get ordered cities for state into LI tag HTML file
     """
-    state_obj = None
-    for state in storage.all("State").values():
-        if state.id == id:
-            state_obj = state
+    state_obj = storage.get("State", id, load="cities")
     return render_template('9-states.html',
                            state_obj=state_obj)
 